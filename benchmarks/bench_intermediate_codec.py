@@ -0,0 +1,141 @@
+"""
+슬라이드 클립 중간 코덱 벤치마크.
+
+clips 모드로 같은 슬라이드들을 중간 코덱별로 렌더링해
+클립 인코딩 시간, 합치기 시간, 중간 파일 크기, 최종 화질을 비교합니다.
+화질은 무압축(raw) 클립을 이어 붙인 프레임을 기준으로 한 최종 영상의 휘도 PSNR입니다.
+h264는 클립과 합치기에서 두 번 손실 인코딩될 수 있고(ffprobe가 없으면 재인코딩),
+무손실 코덱은 합치기에서 한 번만 손실 인코딩합니다.
+
+사용법:
+    python benchmarks/bench_intermediate_codec.py
+    python benchmarks/bench_intermediate_codec.py --width 540 --height 960 --slides 3
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from image_generator import _create_gradient, _add_background_decoration
+from video_generator import (
+    CLIP_EXTENSIONS,
+    INTERMEDIATE_CODECS,
+    _clip_plan,
+    _render_with_clips,
+)
+
+
+GRADIENTS = [
+    (["#0f0c29", "#302b63", "#24243e"], "#FF6B6B"),
+    (["#1a2a6c", "#b21f1f", "#fdbb2d"], "#FFFFFF"),
+    (["#134E5E", "#71B280", "#134E5E"], "#FFD700"),
+]
+
+
+def _job_seconds(log_dir: str) -> tuple:
+    """metrics.jsonl에서 (클립 인코딩 시간 합, 합치기 시간)을 읽습니다."""
+    clip_s, concat_s = 0.0, 0.0
+    with open(os.path.join(log_dir, "metrics.jsonl"), encoding="utf-8") as f:
+        for line in f:
+            metrics = json.loads(line)
+            if metrics["job"] == "concat":
+                concat_s += metrics["elapsed"]
+            else:
+                clip_s += metrics["elapsed"]
+    return clip_s, concat_s
+
+
+def _luma_psnr(video_path: str, reference_list: str) -> float | None:
+    """최종 영상과 기준 클립(concat 목록)의 평균 휘도 PSNR."""
+    result = subprocess.run(
+        ["ffmpeg", "-v", "info", "-i", video_path,
+         "-f", "concat", "-safe", "0", "-i", reference_list,
+         "-lavfi", "[0:v][1:v]psnr", "-f", "null", "-"],
+        capture_output=True, text=True,
+    )
+    match = re.search(r"PSNR y:([\d.]+|inf)", result.stderr)
+    return float(match.group(1)) if match else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="슬라이드 클립 중간 코덱 벤치마크")
+    parser.add_argument("--width", type=int, default=1080, help="영상 너비 (기본: 1080)")
+    parser.add_argument("--height", type=int, default=1920, help="영상 높이 (기본: 1920)")
+    parser.add_argument("--fps", type=int, default=30, help="프레임 레이트 (기본: 30)")
+    parser.add_argument("--duration", type=float, default=3.0, help="슬라이드 길이 (초, 기본: 3)")
+    parser.add_argument("--slides", type=int, default=3, help="슬라이드 수 (기본: 3)")
+    parser.add_argument("--preset", type=str, default=None, help="최종 x264 preset (기본: x264 기본값)")
+    parser.add_argument("--motion-engine", type=str, default="crop", help="Ken Burns 방식 (기본: crop)")
+    args = parser.parse_args()
+
+    if shutil.which("ffmpeg") is None:
+        print("❌ ffmpeg가 필요합니다.")
+        sys.exit(1)
+
+    width, height, fps = args.width, args.height, args.fps
+    can_probe = shutil.which("ffprobe") is not None
+    tmp_dir = tempfile.mkdtemp(prefix="bench_intermediate_codec_")
+
+    try:
+        slide_paths = []
+        for i in range(args.slides):
+            colors, accent = GRADIENTS[i % len(GRADIENTS)]
+            image = _create_gradient(width, height, colors)
+            _add_background_decoration(image, accent)
+            slide_paths.append(os.path.join(tmp_dir, f"slide_{i:02d}.png"))
+            image.save(slide_paths[-1])
+        plan = _clip_plan(len(slide_paths), None, args.duration)
+
+        # 무압축 클립을 먼저 만들어 화질 비교 기준으로 씀
+        codecs = ["raw", *(codec for codec in INTERMEDIATE_CODECS if codec != "raw")]
+        reference_list = None
+
+        print(f"[{width}x{height}, {args.slides} slides x {args.duration}s @ {fps}fps, "
+              f"preset={args.preset or 'default'}, ffprobe={'yes' if can_probe else 'no'}]")
+        print(f"{'codec':<14} {'clips':>9} {'concat':>9} {'total':>9} "
+              f"{'clip size':>11} {'output':>9} {'PSNR(Y)':>9}")
+
+        for codec in codecs:
+            work_dir = os.path.join(tmp_dir, codec)
+            log_dir = os.path.join(work_dir, "logs")
+            os.makedirs(work_dir)
+            output_path = os.path.join(work_dir, "output.mp4")
+
+            start = time.perf_counter()
+            result = _render_with_clips(
+                slide_paths, plan, work_dir, output_path, fps, 0.5, width, height,
+                True, args.preset, None, 0.15, motion_engine=args.motion_engine,
+                can_probe=can_probe, log_dir=log_dir, intermediate_codec=codec,
+            )
+            total_s = time.perf_counter() - start
+            if result.returncode != 0:
+                print(f"{codec:<14} (실패, 로그: {log_dir})")
+                continue
+
+            clip_s, concat_s = _job_seconds(log_dir)
+            clip_bytes = sum(
+                entry.stat().st_size for entry in os.scandir(work_dir)
+                if entry.name.startswith("clip_") and entry.name.endswith(CLIP_EXTENSIONS)
+            )
+            if codec == "raw":
+                reference_list = os.path.join(work_dir, "concat_list.txt")
+            psnr = _luma_psnr(output_path, reference_list) if reference_list else None
+
+            print(f"{codec:<14} {clip_s:>7.2f} s {concat_s:>7.2f} s {total_s:>7.2f} s "
+                  f"{clip_bytes / (1024 * 1024):>8.1f} MB "
+                  f"{os.path.getsize(output_path) / (1024 * 1024):>6.2f} MB "
+                  f"{f'{psnr:.2f} dB' if psnr is not None else '-':>9}")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
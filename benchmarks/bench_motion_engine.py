@@ -0,0 +1,146 @@
+"""
+Ken Burns 모션 엔진 벤치마크.
+
+zoompan / crop / pillow 엔진으로 같은 슬라이드의 줌 프레임을 만들어
+프레임당 생성 시간, 클립 인코딩 시간, 화질(기준 프레임 대비 휘도 PSNR)을 비교합니다.
+기준 프레임은 서브픽셀 box로 BICUBIC 리사이즈한 이상적인 줌 프레임입니다.
+최종 인코딩이 yuv420p라 색차 손실은 어차피 생기므로 휘도(L)만 비교합니다.
+
+사용법:
+    python benchmarks/bench_motion_engine.py
+    python benchmarks/bench_motion_engine.py --width 540 --height 960 --save-frames bench_frames
+"""
+
+import os
+import sys
+import math
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageChops, ImageStat
+
+from image_generator import _create_gradient, _add_background_decoration
+from video_generator import (
+    MOTION_ENGINES,
+    _build_zoom_filter,
+    _create_slide_clip,
+    _pillow_motion_frames,
+    _zoom_factor,
+)
+
+
+def _reference_frame(image: Image.Image, width: int, height: int, frame: int,
+                     total_frames: int, slide_index: int) -> Image.Image:
+    zoom = _zoom_factor(frame, total_frames, slide_index)
+    box_w, box_h = image.width / zoom, image.height / zoom
+    left, top = (image.width - box_w) / 2, (image.height - box_h) / 2
+    return image.resize((width, height), Image.BICUBIC, box=(left, top, left + box_w, top + box_h))
+
+
+def _luma_mse(a: Image.Image, b: Image.Image) -> float:
+    rms = ImageStat.Stat(ImageChops.difference(a.convert("L"), b.convert("L"))).rms[0]
+    return rms * rms
+
+
+def _psnr(mse: float) -> float:
+    return float("inf") if mse == 0 else 10 * math.log10(255 * 255 / mse)
+
+
+def _engine_frames(engine: str, slide_path: str, image: Image.Image, width: int, height: int,
+                   fps: int, duration: float, slide_index: int):
+    """엔진별 RGB 프레임을 차례로 돌려줍니다 (페이드 없이 줌만)."""
+    total_frames = int(fps * duration)
+    if engine == "pillow":
+        for data in _pillow_motion_frames(image, width, height, total_frames, slide_index):
+            yield Image.frombytes("RGB", (width, height), data)
+        return
+
+    # 줌만 비교하기 위해 끝의 페이드 필터는 떼어냄
+    vf = _build_zoom_filter(width, height, fps, duration, 0.5, slide_index, engine)
+    vf = vf.rsplit(",fade=in", 1)[0]
+    process = subprocess.Popen(
+        ["ffmpeg", "-v", "error", "-i", slide_path, "-vf", vf,
+         "-frames:v", str(total_frames), "-r", str(fps),
+         "-f", "rawvideo", "-pix_fmt", "rgb24", "pipe:1"],
+        stdout=subprocess.PIPE,
+    )
+    frame_size = width * height * 3
+    while True:
+        data = process.stdout.read(frame_size)
+        if len(data) < frame_size:
+            break
+        yield Image.frombytes("RGB", (width, height), data)
+    process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ken Burns 모션 엔진 벤치마크")
+    parser.add_argument("--width", type=int, default=1080, help="영상 너비 (기본: 1080)")
+    parser.add_argument("--height", type=int, default=1920, help="영상 높이 (기본: 1920)")
+    parser.add_argument("--fps", type=int, default=30, help="프레임 레이트 (기본: 30)")
+    parser.add_argument("--duration", type=float, default=3.0, help="클립 길이 (초, 기본: 3)")
+    parser.add_argument("--preset", type=str, default="ultrafast", help="x264 preset (기본: ultrafast)")
+    parser.add_argument("--save-frames", type=str, default=None,
+                        help="엔진별 마지막 프레임을 PNG로 저장할 디렉토리")
+    args = parser.parse_args()
+
+    if shutil.which("ffmpeg") is None:
+        print("❌ ffmpeg가 필요합니다.")
+        sys.exit(1)
+
+    width, height, fps, duration = args.width, args.height, args.fps, args.duration
+    total_frames = int(fps * duration)
+    tmp_dir = tempfile.mkdtemp(prefix="bench_motion_engine_")
+
+    try:
+        image = _create_gradient(width, height, ["#0f0c29", "#302b63", "#24243e"])
+        _add_background_decoration(image, "#FF6B6B")
+        slide_path = os.path.join(tmp_dir, "slide.png")
+        image.save(slide_path)
+
+        print(f"[{width}x{height}, {total_frames} frames @ {fps}fps, preset={args.preset}]")
+        print(f"{'engine':<9} {'direction':<9} {'frames':>11} {'clip encode':>12} "
+              f"{'PSNR(min)':>10} {'PSNR(avg)':>10}")
+
+        for engine in MOTION_ENGINES:
+            for slide_index, direction in ((0, "zoom-in"), (1, "zoom-out")):
+                # 1) 프레임 생성 시간 (+ 화질 비교는 시간 측정 밖에서)
+                frames = []
+                start = time.perf_counter()
+                for frame in _engine_frames(engine, slide_path, image, width, height,
+                                            fps, duration, slide_index):
+                    frames.append(frame)
+                frame_ms = (time.perf_counter() - start) * 1000 / max(len(frames), 1)
+
+                errors = [
+                    _luma_mse(frame, _reference_frame(image, width, height, i, total_frames, slide_index))
+                    for i, frame in enumerate(frames)
+                ]
+                if args.save_frames and frames:
+                    os.makedirs(args.save_frames, exist_ok=True)
+                    frames[-1].save(os.path.join(args.save_frames, f"{engine}_{direction}.png"))
+                del frames
+
+                # 2) 실제 클립 인코딩 시간 (페이드 + x264 포함)
+                clip_path = os.path.join(tmp_dir, f"{engine}_{slide_index}.mp4")
+                start = time.perf_counter()
+                ok = _create_slide_clip(
+                    slide_path, clip_path, duration, fps, 0.5, slide_index=slide_index,
+                    width=width, height=height, x264_preset=args.preset, motion_engine=engine,
+                )
+                encode_s = time.perf_counter() - start
+                status = "" if ok else "  (실패)"
+
+                print(f"{engine:<9} {direction:<9} {frame_ms:>6.1f} ms/f {encode_s:>10.2f} s "
+                      f"{_psnr(max(errors)):>7.1f} dB {_psnr(sum(errors) / len(errors)):>7.1f} dB{status}")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+중간 슬라이드 포맷 벤치마크.
+
+generate_slides가 저장하고 ffmpeg가 곧바로 다시 읽는 중간 이미지의
+쓰기 + 디코딩 비용을 포맷별로 비교합니다 (1080x1920, 2160x3840).
+ffmpeg가 설치되어 있으면 ffmpeg 디코딩 시간도 함께 측정합니다.
+
+사용법:
+    python benchmarks/bench_slide_format.py
+    python benchmarks/bench_slide_format.py --repeat 5
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from image_generator import _create_gradient, _add_background_decoration, _save_slide, _slide_filename
+from video_generator import _image_input_args
+
+
+RESOLUTIONS = [(1080, 1920), (2160, 3840)]
+
+FORMATS = [
+    ("png (level 9)", "png", 9),
+    ("png (level 6)", "png", 6),
+    ("png (level 1)", "png", 1),
+    ("png (level 0)", "png", 0),
+    ("bmp", "bmp", None),
+    ("ppm", "ppm", None),
+    ("raw rgb24", "raw", None),
+]
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _pillow_decode(path: str, slide_format: str, width: int, height: int):
+    if slide_format == "raw":
+        with open(path, "rb") as f:
+            Image.frombytes("RGB", (width, height), f.read())
+    else:
+        with Image.open(path) as img:
+            img.load()
+
+
+def _ffmpeg_decode(path: str):
+    subprocess.run(
+        ["ffmpeg", "-v", "error", *_image_input_args(path), "-frames:v", "1", "-f", "null", "-"],
+        check=True, capture_output=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="중간 슬라이드 포맷 벤치마크")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (기본: 3)")
+    args = parser.parse_args()
+
+    has_ffmpeg = shutil.which("ffmpeg") is not None
+    tmp_dir = tempfile.mkdtemp(prefix="bench_slide_format_")
+
+    try:
+        for width, height in RESOLUTIONS:
+            img = _create_gradient(width, height, ["#0f0c29", "#302b63", "#24243e"])
+            _add_background_decoration(img, "#FF6B6B")
+
+            print(f"\n[{width}x{height}]")
+            header = f"{'format':<15} {'size':>9} {'write':>10} {'decode(PIL)':>12}"
+            if has_ffmpeg:
+                header += f" {'decode(ffmpeg)':>15}"
+            print(header)
+
+            for label, slide_format, level in FORMATS:
+                path = os.path.join(tmp_dir, _slide_filename(0, width, height, slide_format))
+                compress_level = level if level is not None else 6
+
+                write_ms = _best_of(
+                    lambda: _save_slide(img, path, slide_format, compress_level), args.repeat
+                )
+                decode_ms = _best_of(
+                    lambda: _pillow_decode(path, slide_format, width, height), args.repeat
+                )
+                size_mb = os.path.getsize(path) / (1024 * 1024)
+
+                row = f"{label:<15} {size_mb:>6.1f} MB {write_ms:>7.1f} ms {decode_ms:>9.1f} ms"
+                if has_ffmpeg:
+                    ffmpeg_ms = _best_of(lambda: _ffmpeg_decode(path), args.repeat)
+                    row += f" {ffmpeg_ms:>12.1f} ms"
+                print(row)
+                os.remove(path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+텍스트 줄바꿈 마이크로 벤치마크.
+
+기존 prefix-getbbox 방식(글자를 하나씩 붙여가며 매번 getbbox 호출)과
+TextLayout(글자별 advance 캐시 + 커닝 보정)을 긴 한국어/영어 문단으로 비교합니다.
+
+사용법:
+    python benchmarks/bench_text_layout.py
+    python benchmarks/bench_text_layout.py --font assets/fonts/MyFont.ttf --repeat 5
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from image_generator import TextLayout, GLYPH_METRICS, _ensure_font, _get_font
+
+
+PARAGRAPHS = {
+    "korean": (
+        "성공은 최종적인 것이 아니며, 실패는 치명적인 것이 아니다. "
+        "중요한 것은 계속 나아가는 용기다. 오늘 하루도 작은 걸음을 내딛는 "
+        "당신을 응원합니다. 어제보다 조금 더 나은 오늘을 만들어 보세요. "
+    ) * 4,
+    "english": (
+        "Success is not final, failure is not fatal: it is the courage to "
+        "continue that counts. Keep taking small steps every day and you "
+        "will be surprised how far you have come by the end of the year. "
+    ) * 4,
+}
+
+
+def _prefix_getbbox_lines(text: str, font, max_width: int) -> list:
+    """기존 구현과 동일한 O(n²) 줄바꿈."""
+    lines = []
+    for paragraph in text.split("\n"):
+        current_line = ""
+        for char in paragraph:
+            test_line = current_line + char
+            bbox = font.getbbox(test_line)
+            if (bbox[2] - bbox[0]) <= max_width:
+                current_line = test_line
+            else:
+                if current_line:
+                    lines.append(current_line)
+                current_line = char
+        if current_line:
+            lines.append(current_line)
+    return lines
+
+
+def _time(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="텍스트 줄바꿈 벤치마크")
+    parser.add_argument("--font", type=str, default=None, help="폰트 파일 경로")
+    parser.add_argument("--size", type=int, default=56, help="폰트 크기 (기본: 56)")
+    parser.add_argument("--max-width", type=int, default=840, help="최대 줄 너비 (기본: 840)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (기본: 3)")
+    args = parser.parse_args()
+
+    font = _get_font(args.font or _ensure_font(), args.size)
+
+    print(f"{'paragraph':<10} {'chars':>6} {'prefix-getbbox':>16} {'TextLayout(cold)':>18} "
+          f"{'TextLayout(warm)':>18} {'speedup':>8}")
+    for name, text in PARAGRAPHS.items():
+        expected = _prefix_getbbox_lines(text, font, args.max_width)
+
+        baseline = _time(lambda: _prefix_getbbox_lines(text, font, args.max_width), args.repeat)
+
+        def cold():
+            GLYPH_METRICS.clear()
+            TextLayout(text, font, args.max_width)
+
+        cold_ms = _time(cold, args.repeat)
+        warm_ms = _time(lambda: TextLayout(text, font, args.max_width), args.repeat)
+
+        lines = [line for line, _, _ in TextLayout(text, font, args.max_width).lines]
+        status = "" if lines == expected else "  (줄바꿈 결과 불일치!)"
+        print(f"{name:<10} {len(text):>6} {baseline:>13.1f} ms {cold_ms:>15.1f} ms "
+              f"{warm_ms:>15.1f} ms {baseline / warm_ms:>7.1f}x{status}")
+
+
+if __name__ == "__main__":
+    main()
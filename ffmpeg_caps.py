@@ -0,0 +1,127 @@
+"""
+설치된 ffmpeg의 기능(버전, 필터, 인코더, 하드웨어 가속)을 확인합니다.
+
+결과는 ffmpeg 실행 파일 경로 + 수정 시각을 키로 메모리와 디스크에 캐시하므로
+ffmpeg를 바꾸거나 업데이트하기 전까지는 다시 확인하지 않습니다.
+"""
+
+import os
+import re
+import json
+import shutil
+import subprocess
+
+
+CAPS_VERSION = 1  # 확인 항목/파싱 방식이 바뀌면 올려서 디스크 캐시 무효화
+CAPS_CACHE = {}   # (실행 파일 경로, mtime) -> 기능 dict
+
+# ffmpeg -filters: " TSC zoompan           V->V       Apply Zoom & Pan effect."
+FILTER_LINE = re.compile(r"^ [T.][S.][C.] (\S+)\s+\S+->\S+", re.MULTILINE)
+# ffmpeg -encoders: " V....D libx264              libx264 H.264 / AVC ..."
+ENCODER_LINE = re.compile(r"^ [VAS][F.][S.][X.][B.][D.] (\S+)", re.MULTILINE)
+
+
+def _run_ffmpeg(binary: str, *args: str) -> str | None:
+    try:
+        result = subprocess.run(
+            [binary, "-hide_banner", *args],
+            capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def _probe(binary: str) -> dict | None:
+    """ffmpeg를 실제로 실행해 기능 목록을 만듭니다."""
+    version_output = _run_ffmpeg(binary, "-version")
+    if version_output is None:
+        return None
+
+    version_match = re.match(r"ffmpeg version (\S+)", version_output)
+    hwaccel_output = _run_ffmpeg(binary, "-hwaccels") or ""
+
+    return {
+        "version": version_match.group(1) if version_match else "unknown",
+        "filters": sorted(FILTER_LINE.findall(_run_ffmpeg(binary, "-filters") or "")),
+        "encoders": sorted(ENCODER_LINE.findall(_run_ffmpeg(binary, "-encoders") or "")),
+        "hwaccels": [
+            line.strip() for line in hwaccel_output.splitlines()[1:] if line.strip()
+        ],
+        "ffprobe": shutil.which("ffprobe") is not None,
+    }
+
+
+def probe_ffmpeg(cache_dir: str = None) -> dict | None:
+    """
+    ffmpeg 기능을 확인합니다 (캐시 사용).
+
+    Args:
+        cache_dir: 디스크 캐시 디렉토리 (None이면 메모리 캐시만 사용)
+
+    Returns:
+        {"path", "version", "filters", "encoders", "hwaccels", "ffprobe"} dict,
+        ffmpeg가 없거나 실행되지 않으면 None
+    """
+    binary = shutil.which("ffmpeg")
+    if binary is None:
+        return None
+    binary = os.path.realpath(binary)
+    try:
+        mtime = os.stat(binary).st_mtime_ns
+    except OSError:
+        return None
+
+    key = (binary, mtime)
+    if key in CAPS_CACHE:
+        return CAPS_CACHE[key]
+
+    disk_key = f"{CAPS_VERSION}:{binary}:{mtime}"
+    disk_path = os.path.join(cache_dir, "ffmpeg_caps.json") if cache_dir else None
+    disk_cache = {}
+    if disk_path and os.path.exists(disk_path):
+        try:
+            with open(disk_path, encoding="utf-8") as f:
+                disk_cache = json.load(f)
+        except (OSError, ValueError):
+            disk_cache = {}  # 손상된 캐시는 다시 만듦
+
+    caps = disk_cache.get(disk_key)
+    if caps is None:
+        caps = _probe(binary)
+        if caps is None:
+            return None
+        caps["path"] = binary
+        if disk_path:
+            # 다른 ffmpeg 바이너리의 결과는 유지하고, 이전 버전 키만 정리
+            disk_cache = {
+                k: v for k, v in disk_cache.items() if k.startswith(f"{CAPS_VERSION}:")
+            }
+            disk_cache[disk_key] = caps
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{disk_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(disk_cache, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, disk_path)
+
+    CAPS_CACHE[key] = caps
+    return caps
+
+
+def has_filters(caps: dict, *names: str) -> bool:
+    """필터가 모두 있는지 확인합니다."""
+    available = set(caps["filters"])
+    return all(name in available for name in names)
+
+
+def has_encoder(caps: dict, name: str) -> bool:
+    """인코더가 있는지 확인합니다."""
+    return name in caps["encoders"]
+
+
+def version_at_least(caps: dict, major: int, minor: int = 0) -> bool:
+    """ffmpeg 버전이 major.minor 이상인지 확인합니다 (git 빌드처럼 알 수 없는 버전은 최신으로 간주)."""
+    match = re.match(r"n?(\d+)\.(\d+)", caps["version"])
+    if not match:
+        return True
+    return (int(match.group(1)), int(match.group(2))) >= (major, minor)
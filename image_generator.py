@@ -6,7 +6,12 @@ import os
 import re
 import math
 import random
+import json
+import hashlib
 import urllib.request
+from collections import OrderedDict
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 
@@ -19,6 +24,25 @@ FONT_URLS = {
 FONT_DIR = Path("assets/fonts")
 FONT_CACHE = {}
 
+# 중간 슬라이드 파일 포맷 (ffmpeg가 바로 다시 읽으므로 압축은 선택사항)
+# raw는 헤더 없는 RGB24 바이트이며, 파일명에 해상도를 넣어 ffmpeg 입력 옵션을 알 수 있게 합니다.
+SLIDE_FORMATS = {
+    "png": ".png",
+    "bmp": ".bmp",
+    "ppm": ".ppm",
+    "raw": ".rgb",
+}
+
+# 배경 레이어 캐시 (그라데이션 + 장식), 테마/해상도별 1회만 렌더링
+BACKGROUND_CACHE = OrderedDict()
+BACKGROUND_CACHE_SIZE = 8
+BACKGROUND_VERSION = 1  # 배경 렌더링 방식이 바뀌면 올려서 디스크 캐시 무효화
+
+# 슬라이드 결과 디스크 캐시 (내용 해시 기반, 실행 간 재사용)
+RENDERER_VERSION = 1  # 슬라이드 레이아웃/그리기 방식이 바뀌면 올려서 캐시 무효화
+SLIDE_CACHE_MB = 512
+FONT_DIGESTS = {}
+
 
 def _ensure_font() -> str:
     """폰트 파일이 없으면 다운로드합니다."""
@@ -81,20 +105,13 @@ def _strip_emoji(text: str) -> str:
     return emoji_pattern.sub("", text).strip()
 
 
-def _create_gradient(width: int, height: int, colors: list) -> Image.Image:
-    """세로 그라데이션 배경을 생성합니다."""
-    img = Image.new("RGB", (width, height))
-    draw = ImageDraw.Draw(img)
-
+def _gradient_stops(height: int, colors: list) -> bytes:
+    """그라데이션의 행별 RGB 값을 한 번에 계산합니다 (1픽셀 폭 룩업 테이블)."""
     rgb_colors = [_hex_to_rgb(c) for c in colors]
-
-    if len(rgb_colors) == 1:
-        img.paste(rgb_colors[0], (0, 0, width, height))
-        return img
-
     segments = len(rgb_colors) - 1
     segment_height = height / segments
 
+    table = bytearray(height * 3)
     for y in range(height):
         segment_idx = min(int(y / segment_height), segments - 1)
         local_pos = (y - segment_idx * segment_height) / segment_height
@@ -102,13 +119,26 @@ def _create_gradient(width: int, height: int, colors: list) -> Image.Image:
         c1 = rgb_colors[segment_idx]
         c2 = rgb_colors[segment_idx + 1]
 
-        r = int(c1[0] + (c2[0] - c1[0]) * local_pos)
-        g = int(c1[1] + (c2[1] - c1[1]) * local_pos)
-        b = int(c1[2] + (c2[2] - c1[2]) * local_pos)
+        table[y * 3] = int(c1[0] + (c2[0] - c1[0]) * local_pos)
+        table[y * 3 + 1] = int(c1[1] + (c2[1] - c1[1]) * local_pos)
+        table[y * 3 + 2] = int(c1[2] + (c2[2] - c1[2]) * local_pos)
 
-        draw.line([(0, y), (width, y)], fill=(r, g, b))
+    return bytes(table)
 
-    return img
+
+def _create_gradient(width: int, height: int, colors: list) -> Image.Image:
+    """
+    세로 그라데이션 배경을 생성합니다.
+
+    행마다 draw.line을 호출하는 대신 1픽셀 폭 컬럼을 계산한 뒤
+    NEAREST 리사이즈로 가로로 늘립니다 (기존 방식과 픽셀 단위로 동일).
+    색상 stop 개수에는 제한이 없습니다.
+    """
+    if len(colors) == 1:
+        return Image.new("RGB", (width, height), _hex_to_rgb(colors[0]))
+
+    column = Image.frombytes("RGB", (1, height), _gradient_stops(height, colors))
+    return column.resize((width, height), Image.NEAREST)
 
 
 def _add_background_decoration(img: Image.Image, accent_color: str):
@@ -157,145 +187,371 @@ def _add_background_decoration(img: Image.Image, accent_color: str):
     draw.line([(width - 60, height - 60), (width - 60 - corner_len, height - 60)], fill=(*color, corner_alpha), width=2)
     draw.line([(width - 60, height - 60), (width - 60, height - 60 - corner_len)], fill=(*color, corner_alpha), width=2)
 
-    # 합성
-    img.paste(Image.alpha_composite(img.convert("RGBA"), overlay).convert("RGB"))
+    # 합성 (장식이 실제로 그려진 영역만)
+    _composite_region(img, overlay, overlay.getbbox())
+
+
+def _get_background(width: int, height: int, gradient: list, accent_color: str,
+                    cache_dir: str = None) -> Image.Image:
+    """
+    그라데이션 + 장식이 적용된 배경을 캐시에서 가져옵니다.
+
+    장식은 random.seed(42)로 고정되어 있어 테마/해상도가 같으면 결과도 같습니다.
+    메모리 LRU(BACKGROUND_CACHE_SIZE개)를 먼저 보고, cache_dir이 주어지면
+    디스크에 PNG로도 저장합니다. 호출자가 수정할 수 있도록 항상 복사본을 반환합니다.
+    """
+    key = (tuple(gradient), accent_color, width, height)
+    base = BACKGROUND_CACHE.get(key)
+
+    if base is not None:
+        BACKGROUND_CACHE.move_to_end(key)
+        return base.copy()
+
+    disk_path = None
+    if cache_dir:
+        digest = hashlib.sha1(repr((BACKGROUND_VERSION, key)).encode("utf-8")).hexdigest()
+        disk_path = os.path.join(cache_dir, "backgrounds", f"{digest}.png")
+        if os.path.exists(disk_path):
+            try:
+                with Image.open(disk_path) as cached:
+                    base = cached.convert("RGB")
+            except OSError:
+                base = None
+
+    if base is None:
+        base = _create_gradient(width, height, gradient)
+        _add_background_decoration(base, accent_color)
+        if disk_path:
+            os.makedirs(os.path.dirname(disk_path), exist_ok=True)
+            tmp_path = f"{disk_path}.{os.getpid()}.tmp"
+            base.save(tmp_path, "PNG")
+            os.replace(tmp_path, disk_path)
+
+    BACKGROUND_CACHE[key] = base
+    while len(BACKGROUND_CACHE) > BACKGROUND_CACHE_SIZE:
+        BACKGROUND_CACHE.popitem(last=False)
+
+    return base.copy()
+
+
+def _composite_region(img: Image.Image, overlay: Image.Image, box: tuple, offset: tuple = (0, 0)):
+    """
+    RGBA overlay를 img의 box 영역에만 알파 합성합니다.
+
+    전체 프레임을 RGBA로 변환하지 않고 box 영역만 잘라서 합성 후 다시 붙입니다.
+    offset은 img 좌표계에서 overlay의 (0, 0)이 놓이는 위치입니다.
+    """
+    if not box:
+        return
+    left = max(box[0], 0)
+    top = max(box[1], 0)
+    right = min(box[2], img.width)
+    bottom = min(box[3], img.height)
+    if left >= right or top >= bottom:
+        return
+
+    region = img.crop((left, top, right, bottom)).convert("RGBA")
+    layer = overlay.crop((left - offset[0], top - offset[1], right - offset[0], bottom - offset[1]))
+    img.paste(Image.alpha_composite(region, layer).convert("RGB"), (left, top))
+
+
+# 카드 마스크 캐시 (크기/반경별로 한 번만 그림)
+CARD_MASK_CACHE = OrderedDict()
+CARD_MASK_CACHE_SIZE = 32
+
+
+def _get_card_mask(w: int, h: int, radius: int) -> Image.Image:
+    """반투명 둥근 사각형 카드 레이어를 캐시에서 가져오거나 새로 그립니다."""
+    key = (w, h, radius)
+    card = CARD_MASK_CACHE.get(key)
+    if card is None:
+        card = Image.new("RGBA", (w + 1, h + 1), (0, 0, 0, 0))
+        ImageDraw.Draw(card).rounded_rectangle(
+            [0, 0, w, h],
+            radius=radius,
+            fill=(0, 0, 0, 70),
+        )
+        CARD_MASK_CACHE[key] = card
+        while len(CARD_MASK_CACHE) > CARD_MASK_CACHE_SIZE:
+            CARD_MASK_CACHE.popitem(last=False)
+    else:
+        CARD_MASK_CACHE.move_to_end(key)
+    return card
 
 
 def _draw_text_card(img: Image.Image, x: int, y: int, w: int, h: int, radius: int = 30):
-    """텍스트 뒤에 반투명 카드 배경을 그립니다."""
-    overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
-    draw.rounded_rectangle(
-        [x, y, x + w, y + h],
-        radius=radius,
-        fill=(0, 0, 0, 70),
-    )
-    result = Image.alpha_composite(img.convert("RGBA"), overlay).convert("RGB")
-    img.paste(result)
+    """텍스트 뒤에 반투명 카드 배경을 그립니다 (카드 영역만 합성)."""
+    card = _get_card_mask(w, h, radius)
+    _composite_region(img, card, (x, y, x + card.width, y + card.height), offset=(x, y))
 
 
-def _draw_text_wrapped(draw: ImageDraw.Draw, text: str, font: ImageFont.FreeTypeFont,
-                       max_width: int, x: int, y: int, fill: tuple,
-                       align: str = "center", line_spacing: int = 15) -> int:
-    """텍스트를 자동 줄바꿈하며 그립니다. 최종 y 위치를 반환합니다."""
-    # 이모지 제거
-    text = _strip_emoji(text)
-    if not text:
-        return y
+class _GlyphMetrics:
+    """폰트별 글자 advance/bbox와 커닝 보정값을 캐시합니다."""
 
-    lines = []
+    def __init__(self, font: ImageFont.FreeTypeFont):
+        self.font = font
+        self._advances = {}
+        self._bboxes = {}
+        self._kerning = {}
 
-    # \n 을 실제 줄바꿈으로 처리
-    paragraphs = text.split("\\n") if "\\n" in text else text.split("\n")
+    def advance(self, char: str) -> float:
+        if char not in self._advances:
+            self._advances[char] = self.font.getlength(char)
+        return self._advances[char]
 
-    for paragraph in paragraphs:
-        words = list(paragraph)
-        current_line = ""
+    def bbox(self, char: str) -> tuple:
+        if char not in self._bboxes:
+            self._bboxes[char] = self.font.getbbox(char)
+        return self._bboxes[char]
 
-        for char in words:
-            test_line = current_line + char
-            bbox = font.getbbox(test_line)
-            text_width = bbox[2] - bbox[0]
+    def kerning(self, left: str, right: str) -> float:
+        """두 글자를 붙였을 때 advance 합과의 차이 (커닝 보정)."""
+        pair = left + right
+        if pair not in self._kerning:
+            self._kerning[pair] = (
+                self.font.getlength(pair) - self.advance(left) - self.advance(right)
+            )
+        return self._kerning[pair]
 
-            if text_width <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = char
-
-        if current_line:
-            lines.append(current_line)
-
-    current_y = y
-    for line in lines:
-        bbox = font.getbbox(line)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-
-        if align == "center":
-            text_x = x - text_width // 2
-        elif align == "left":
-            text_x = x
-        else:
-            text_x = x - text_width
 
-        # 텍스트 그림자 효과 (2단계)
-        shadow_color = (0, 0, 0)
-        draw.text((text_x + 3, current_y + 3), line, font=font, fill=shadow_color)
-        draw.text((text_x + 1, current_y + 1), line, font=font, fill=shadow_color)
-        draw.text((text_x, current_y), line, font=font, fill=fill)
+GLYPH_METRICS = {}
 
-        current_y += text_height + line_spacing
+# TextLayout 캐시 (높이 계산과 그리기에서 같은 레이아웃을 재사용)
+LAYOUT_CACHE = OrderedDict()
+LAYOUT_CACHE_SIZE = 64
 
-    return current_y
 
+def _get_glyph_metrics(font: ImageFont.FreeTypeFont) -> _GlyphMetrics:
+    if font not in GLYPH_METRICS:
+        GLYPH_METRICS[font] = _GlyphMetrics(font)
+    return GLYPH_METRICS[font]
 
-def _calc_text_block_height(text: str, font: ImageFont.FreeTypeFont,
-                            max_width: int, line_spacing: int = 15) -> int:
-    """텍스트 블록의 높이를 미리 계산합니다."""
-    text = _strip_emoji(text)
-    if not text:
-        return 0
 
-    paragraphs = text.split("\\n") if "\\n" in text else text.split("\n")
-    total_height = 0
-    line_count = 0
-
-    for paragraph in paragraphs:
-        current_line = ""
-        for char in list(paragraph):
-            test_line = current_line + char
-            bbox = font.getbbox(test_line)
-            if (bbox[2] - bbox[0]) <= max_width:
-                current_line = test_line
+class TextLayout:
+    """
+    자동 줄바꿈 결과를 한 번 계산해 두고 높이 계산과 그리기에 함께 사용합니다.
+
+    글자별 advance(+커닝 보정)를 누적해 줄 너비를 추정하므로 문단 길이에 선형입니다.
+    추정값이 max_width 근처(허용 오차 이내)일 때만 실제 getbbox로 확인하기 때문에
+    줄바꿈 위치는 기존 getbbox 방식과 동일합니다.
+    """
+
+    def __init__(self, text: str, font: ImageFont.FreeTypeFont, max_width: int):
+        self.text = text
+        self.font = font
+        self.max_width = max_width
+        self.lines = []  # [(라인 텍스트, 너비, 높이), ...]
+        self._masks = {}  # (줄 인덱스, 블러 반경) -> (마스크, x 오프셋, y 오프셋)
+
+        # \n 을 실제 줄바꿈으로 처리
+        paragraphs = text.split("\\n") if "\\n" in text else text.split("\n")
+        for paragraph in paragraphs:
+            for line in self._break_paragraph(paragraph):
+                bbox = font.getbbox(line)
+                self.lines.append((line, bbox[2] - bbox[0], bbox[3] - bbox[1]))
+
+    def _fits(self, estimate: float, test_line: str) -> bool:
+        # advance 기반 추정은 힌팅/반올림만큼(1px 미만) 오차가 있으므로 경계 근처만 정확히 측정
+        tolerance = 2 + getattr(self.font, "size", 10) / 16
+        if estimate <= self.max_width - tolerance:
+            return True
+        if estimate > self.max_width + tolerance:
+            return False
+        bbox = self.font.getbbox(test_line)
+        return (bbox[2] - bbox[0]) <= self.max_width
+
+    def _break_paragraph(self, paragraph: str) -> list:
+        metrics = _get_glyph_metrics(self.font)
+        lines = []
+        line_start = 0
+        pen = 0.0  # 현재 줄의 advance 합
+
+        for i, char in enumerate(paragraph):
+            char_right = metrics.bbox(char)[2]
+            if i == line_start:
+                estimate = char_right - metrics.bbox(char)[0]
+                kern = 0.0
             else:
-                if current_line:
-                    bbox2 = font.getbbox(current_line)
-                    total_height += (bbox2[3] - bbox2[1]) + line_spacing
-                    line_count += 1
-                current_line = char
-        if current_line:
-            bbox2 = font.getbbox(current_line)
-            total_height += (bbox2[3] - bbox2[1]) + line_spacing
-            line_count += 1
+                kern = metrics.kerning(paragraph[i - 1], char)
+                estimate = pen + kern + char_right - metrics.bbox(paragraph[line_start])[0]
 
-    return total_height
+            if self._fits(estimate, paragraph[line_start:i + 1]):
+                pen += kern + metrics.advance(char)
+            else:
+                if i > line_start:
+                    lines.append(paragraph[line_start:i])
+                line_start = i
+                pen = metrics.advance(char)
+
+        if line_start < len(paragraph):
+            lines.append(paragraph[line_start:])
+
+        return lines
+
+    def height(self, line_spacing: int = 15) -> int:
+        """줄 간격을 포함한 전체 블록 높이를 반환합니다."""
+        return sum(line_height + line_spacing for _, _, line_height in self.lines)
+
+    def _line_mask(self, index: int, blur: float = 0) -> tuple:
+        """
+        줄 하나의 글리프 마스크(L)를 한 번만 래스터화해 캐시합니다.
+
+        Returns:
+            (마스크, x 오프셋, y 오프셋) - 오프셋은 텍스트 원점 기준
+        """
+        key = (index, blur)
+        if key not in self._masks:
+            if blur:
+                mask, ox, oy = self._line_mask(index)
+                pad = int(math.ceil(blur * 3))
+                padded = Image.new("L", (mask.width + pad * 2, mask.height + pad * 2), 0)
+                padded.paste(mask, (pad, pad))
+                self._masks[key] = (padded.filter(ImageFilter.GaussianBlur(blur)), ox - pad, oy - pad)
+            else:
+                line = self.lines[index][0]
+                bbox = self.font.getbbox(line)
+                ox, oy = min(bbox[0], 0), min(bbox[1], 0)
+                mask = Image.new("L", (max(bbox[2] - ox, 1), max(bbox[3] - oy, 1)), 0)
+                ImageDraw.Draw(mask).text((-ox, -oy), line, font=self.font, fill=255)
+                self._masks[key] = (mask, ox, oy)
+        return self._masks[key]
+
+    def draw(self, img: Image.Image, x: int, y: int, fill: tuple,
+             align: str = "center", line_spacing: int = 15,
+             shadow_offsets: tuple = ((3, 3), (1, 1)), shadow_color: tuple = (0, 0, 0),
+             shadow_blur: float = 0) -> int:
+        """
+        레이아웃된 줄을 그림자와 함께 그립니다. 최종 y 위치를 반환합니다.
+
+        줄마다 글리프 마스크를 한 번만 래스터화하고, 그림자는 같은 마스크를
+        오프셋만 바꿔 합성합니다. shadow_blur > 0이면 블러 처리된 마스크를 사용합니다.
+        """
+        current_y = y
+        for index, (line, text_width, text_height) in enumerate(self.lines):
+            if align == "center":
+                text_x = x - text_width // 2
+            elif align == "left":
+                text_x = x
+            else:
+                text_x = x - text_width
 
+            # 텍스트 그림자 효과 (오프셋별로 같은 마스크 재사용)
+            shadow_mask, sx, sy = self._line_mask(index, shadow_blur)
+            for dx, dy in shadow_offsets:
+                img.paste(shadow_color, (text_x + dx + sx, current_y + dy + sy), shadow_mask)
 
-def create_slide(
-    slide_data: dict,
-    theme: dict,
-    width: int = 1080,
-    height: int = 1920,
-    slide_type: str = "content",
-    font_path: str = None,
-) -> Image.Image:
-    """
-    단일 슬라이드 이미지를 생성합니다.
+            mask, mx, my = self._line_mask(index)
+            img.paste(fill, (text_x + mx, current_y + my), mask)
 
-    Args:
-        slide_data: 슬라이드 데이터 (main_text, sub_text 등)
-        theme: 테마 설정
-        width: 이미지 너비
-        height: 이미지 높이
-        slide_type: 슬라이드 유형 (intro, content, outro)
-        font_path: 폰트 파일 경로
+            current_y += text_height + line_spacing
 
-    Returns:
-        생성된 PIL Image
-    """
-    # 배경 그라데이션 생성
-    img = _create_gradient(width, height, theme["gradient"])
+        return current_y
 
-    # 배경 장식 요소 추가
-    _add_background_decoration(img, theme["accent_color"])
 
-    draw = ImageDraw.Draw(img)
+def _get_text_layout(text: str, font: ImageFont.FreeTypeFont, max_width: int) -> TextLayout:
+    """TextLayout을 캐시에서 가져오거나 새로 계산합니다."""
+    key = (text, font, max_width)
+    layout = LAYOUT_CACHE.get(key)
+    if layout is None:
+        layout = TextLayout(text, font, max_width)
+        LAYOUT_CACHE[key] = layout
+        while len(LAYOUT_CACHE) > LAYOUT_CACHE_SIZE:
+            LAYOUT_CACHE.popitem(last=False)
+    else:
+        LAYOUT_CACHE.move_to_end(key)
+    return layout
 
-    # 폰트 준비
-    if not font_path:
-        font_path = _ensure_font()
+
+def _draw_text_wrapped(img: Image.Image, text: str, font: ImageFont.FreeTypeFont,
+                       max_width: int, x: int, y: int, fill: tuple,
+                       align: str = "center", line_spacing: int = 15,
+                       shadow_blur: float = 0) -> int:
+    """텍스트를 자동 줄바꿈하며 그립니다. 최종 y 위치를 반환합니다."""
+    # 이모지 제거
+    text = _strip_emoji(text)
+    if not text:
+        return y
+
+    layout = _get_text_layout(text, font, max_width)
+    return layout.draw(img, x, y, fill, align, line_spacing, shadow_blur=shadow_blur)
+
+
+def _calc_text_block_height(text: str, font: ImageFont.FreeTypeFont,
+                            max_width: int, line_spacing: int = 15) -> int:
+    """텍스트 블록의 높이를 미리 계산합니다."""
+    text = _strip_emoji(text)
+    if not text:
+        return 0
+
+    return _get_text_layout(text, font, max_width).height(line_spacing)
+
+
+def _font_digest(font_path: str) -> str:
+    """폰트 파일 내용의 해시를 반환합니다 (경로/수정시각/크기별로 캐시)."""
+    if not font_path or not os.path.exists(font_path):
+        return "default"
+    stat = os.stat(font_path)
+    key = (os.path.abspath(font_path), stat.st_mtime_ns, stat.st_size)
+    if key not in FONT_DIGESTS:
+        digest = hashlib.sha256()
+        with open(font_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        FONT_DIGESTS[key] = digest.hexdigest()
+    return FONT_DIGESTS[key]
+
+
+def _slide_cache_key(slide_data: dict, theme: dict, width: int, height: int,
+                     slide_type: str, font_path: str) -> str:
+    """슬라이드 렌더링 결과를 결정하는 모든 입력의 해시를 만듭니다."""
+    payload = {
+        "version": RENDERER_VERSION,
+        "slide_data": slide_data,
+        "slide_type": slide_type,
+        "theme": theme,
+        "size": [width, height],
+        "font": _font_digest(font_path),
+    }
+    if slide_type == "intro":
+        # 인트로에는 오늘 날짜가 찍히므로 날짜가 바뀌면 다시 렌더링
+        payload["date"] = date.today().isoformat()
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _evict_slide_cache(slides_dir: str, max_bytes: int):
+    """슬라이드 캐시가 max_bytes를 넘으면 가장 오래 사용하지 않은 파일부터 지웁니다."""
+    entries = []
+    total = 0
+    for entry in os.scandir(slides_dir):
+        if not entry.name.endswith(".png"):
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total += stat.st_size
+
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def _draw_slide(slide_data: dict, theme: dict, width: int, height: int,
+                slide_type: str, font_path: str, cache_dir: str = None) -> Image.Image:
+    """슬라이드 한 장을 실제로 그립니다 (슬라이드 캐시 없이)."""
+    # 배경 그라데이션 + 장식 요소 (테마별 캐시)
+    img = _get_background(width, height, theme["gradient"], theme["accent_color"], cache_dir)
+
+    # 텍스트 그림자 블러 (테마에서 지정, 0이면 기존 하드 섀도)
+    shadow_blur = theme.get("shadow_blur", 0)
 
     center_x = width // 2
     padding = 120
@@ -311,20 +567,19 @@ def create_slide(
         card_y = height // 2 - 120
         card_h = title_h + 160
         _draw_text_card(img, padding - 40, card_y - 40, width - (padding - 40) * 2, card_h)
-        draw = ImageDraw.Draw(img)  # draw 재생성 (이미지가 교체되므로)
 
         # 타이틀
         title_color = _hex_to_rgb(theme["title_color"])
-        _draw_text_wrapped(draw, title, title_font, max_text_width,
-                           center_x, card_y, title_color)
+        _draw_text_wrapped(img, title, title_font, max_text_width,
+                           center_x, card_y, title_color, shadow_blur=shadow_blur)
 
         # 날짜
         sub_font = _get_font(font_path, 36)
         sub_color = _hex_to_rgb(theme["subtitle_color"])
-        from datetime import date
         today = date.today().strftime("%Y.%m.%d")
-        _draw_text_wrapped(draw, today, sub_font, max_text_width,
-                           center_x, card_y + title_h + 30, sub_color)
+        _draw_text_wrapped(img, today, sub_font, max_text_width,
+                           center_x, card_y + title_h + 30, sub_color,
+                           shadow_blur=shadow_blur)
 
     elif slide_type == "outro":
         # ===== 아웃트로 슬라이드 =====
@@ -339,17 +594,16 @@ def create_slide(
         card_y = height // 2 - 120
         card_h = text_h + sub_h + 180
         _draw_text_card(img, padding - 40, card_y - 40, width - (padding - 40) * 2, card_h)
-        draw = ImageDraw.Draw(img)
 
         # 메인 텍스트
         text_color = _hex_to_rgb(theme["text_color"])
-        end_y = _draw_text_wrapped(draw, outro_text, main_font, max_text_width,
-                                   center_x, card_y, text_color)
+        end_y = _draw_text_wrapped(img, outro_text, main_font, max_text_width,
+                                   center_x, card_y, text_color, shadow_blur=shadow_blur)
 
         # 구독/좋아요 안내
         accent_color = _hex_to_rgb(theme["accent_color"])
-        _draw_text_wrapped(draw, sub_text, sub_font, max_text_width,
-                           center_x, end_y + 40, accent_color)
+        _draw_text_wrapped(img, sub_text, sub_font, max_text_width,
+                           center_x, end_y + 40, accent_color, shadow_blur=shadow_blur)
 
     else:
         # ===== 콘텐츠 슬라이드 =====
@@ -368,26 +622,242 @@ def create_slide(
         card_y = height // 2 - total_h // 2 - 40
         card_h = total_h + 80
         _draw_text_card(img, padding - 40, card_y, width - (padding - 40) * 2, card_h)
-        draw = ImageDraw.Draw(img)
 
         # 메인 텍스트
         text_color = _hex_to_rgb(theme["text_color"])
         start_y = card_y + 40
-        end_y = _draw_text_wrapped(draw, main_text, main_font, max_text_width,
-                                   center_x, start_y, text_color, line_spacing=20)
+        end_y = _draw_text_wrapped(img, main_text, main_font, max_text_width,
+                                   center_x, start_y, text_color, line_spacing=20,
+                                   shadow_blur=shadow_blur)
 
         # 서브 텍스트
         if sub_text:
             sub_font = _get_font(font_path, 38)
             sub_color = _hex_to_rgb(theme["subtitle_color"])
-            _draw_text_wrapped(draw, sub_text, sub_font, max_text_width,
-                               center_x, end_y + 40, sub_color)
+            _draw_text_wrapped(img, sub_text, sub_font, max_text_width,
+                               center_x, end_y + 40, sub_color, shadow_blur=shadow_blur)
+
+    return img
+
+
+def create_slide(
+    slide_data: dict,
+    theme: dict,
+    width: int = 1080,
+    height: int = 1920,
+    slide_type: str = "content",
+    font_path: str = None,
+    cache_dir: str = None,
+    slide_cache_mb: int = SLIDE_CACHE_MB,
+    output_scale: float = 1.0,
+) -> Image.Image:
+    """
+    단일 슬라이드 이미지를 생성합니다.
+
+    cache_dir이 주어지면 (slide_data, slide_type, theme, 해상도, 폰트 파일 해시,
+    RENDERER_VERSION)의 해시로 결과를 디스크에 캐시해 두고, 같은 슬라이드는
+    다시 그리지 않고 파일에서 읽습니다. 캐시는 slide_cache_mb를 넘으면 LRU로 정리됩니다.
+
+    Args:
+        slide_data: 슬라이드 데이터 (main_text, sub_text 등)
+        theme: 테마 설정
+        width: 이미지 너비
+        height: 이미지 높이
+        slide_type: 슬라이드 유형 (intro, content, outro)
+        font_path: 폰트 파일 경로
+        cache_dir: 배경/슬라이드 디스크 캐시 디렉토리 (None이면 메모리 캐시만 사용)
+        slide_cache_mb: 슬라이드 디스크 캐시 최대 크기 (MB)
+        output_scale: 결과 이미지 배율 (미리보기용, 레이아웃은 width x height 기준 그대로)
+
+    Returns:
+        생성된 PIL Image
+    """
+    img = _create_slide_cached(slide_data, theme, width, height, slide_type,
+                               font_path, cache_dir, slide_cache_mb)
+    if output_scale != 1.0:
+        # 레이아웃이 최종 영상과 같도록 원래 크기로 그린 뒤 축소
+        img = img.resize(scaled_size(width, height, output_scale), Image.LANCZOS)
+    return img
+
+
+def scaled_size(width: int, height: int, scale: float) -> tuple:
+    """배율을 적용한 해상도 (libx264/yuv420p를 위해 짝수로 맞춤)."""
+    return (max(2, int(width * scale) // 2 * 2), max(2, int(height * scale) // 2 * 2))
+
+
+def _create_slide_cached(slide_data: dict, theme: dict, width: int, height: int,
+                         slide_type: str, font_path: str, cache_dir: str,
+                         slide_cache_mb: int) -> Image.Image:
+    """슬라이드 디스크 캐시를 확인하고 없으면 그려서 저장합니다."""
+    # 폰트 준비
+    if not font_path:
+        font_path = _ensure_font()
+
+    if not cache_dir:
+        return _draw_slide(slide_data, theme, width, height, slide_type, font_path)
+
+    slides_dir = os.path.join(cache_dir, "slides")
+    key = _slide_cache_key(slide_data, theme, width, height, slide_type, font_path)
+    cache_path = os.path.join(slides_dir, f"{key}.png")
+
+    if os.path.exists(cache_path):
+        try:
+            with Image.open(cache_path) as cached:
+                img = cached.convert("RGB")
+            os.utime(cache_path)  # LRU: 최근 사용 시각 갱신
+            return img
+        except OSError:
+            pass
+
+    img = _draw_slide(slide_data, theme, width, height, slide_type, font_path, cache_dir)
+
+    os.makedirs(slides_dir, exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    img.save(tmp_path, "PNG", compress_level=1)
+    os.replace(tmp_path, cache_path)
+    _evict_slide_cache(slides_dir, slide_cache_mb * 1024 * 1024)
 
     return img
 
 
+def _slide_jobs(content: dict) -> list:
+    """
+    슬라이드 렌더링 작업 목록을 순서대로 만듭니다.
+
+    Returns:
+        [(라벨, slide_data, slide_type), ...] - 인트로, 콘텐츠..., 아웃트로 순서
+    """
+    jobs = [("인트로 슬라이드", {"intro_title": content.get("intro_title", "")}, "intro")]
+    for i, slide_data in enumerate(content.get("slides", [])):
+        jobs.append((f"콘텐츠 슬라이드 {i+1}", slide_data, "content"))
+    jobs.append((
+        "아웃트로 슬라이드",
+        {"outro_text": content.get("outro_text", "다음에 또 만나요!")},
+        "outro",
+    ))
+    return jobs
+
+
+def _init_render_worker(font_path: str):
+    """워커 프로세스 시작 시 자주 쓰는 폰트를 미리 로드합니다 (프로세스 수명 동안 유지)."""
+    for size in (36, 38, 52, 56, 80):
+        _get_font(font_path, size)
+
+
+def _slide_filename(index: int, width: int, height: int, slide_format: str) -> str:
+    """슬라이드 파일명을 만듭니다 (raw 포맷은 해상도를 파일명에 포함)."""
+    if slide_format == "raw":
+        return f"slide_{index:03d}_{width}x{height}{SLIDE_FORMATS['raw']}"
+    return f"slide_{index:03d}{SLIDE_FORMATS[slide_format]}"
+
+
+def _save_slide(img: Image.Image, path: str, slide_format: str = "png",
+                png_compress_level: int = 6):
+    """슬라이드를 지정한 중간 포맷으로 저장합니다."""
+    if slide_format == "png":
+        img.save(path, "PNG", compress_level=png_compress_level)
+    elif slide_format == "bmp":
+        img.save(path, "BMP")
+    elif slide_format == "ppm":
+        img.save(path, "PPM")
+    elif slide_format == "raw":
+        with open(path, "wb") as f:
+            f.write(img.convert("RGB").tobytes())
+    else:
+        raise ValueError(f"지원하지 않는 슬라이드 포맷: {slide_format}")
+
+
+def _render_slide_to_file(slide_data: dict, theme: dict, width: int, height: int,
+                          slide_type: str, font_path: str, cache_dir: str, path: str,
+                          slide_format: str = "png", png_compress_level: int = 6,
+                          slide_cache_mb: int = SLIDE_CACHE_MB,
+                          output_scale: float = 1.0) -> str:
+    """슬라이드 한 장을 렌더링해 파일로 저장합니다 (워커 프로세스에서도 호출)."""
+    img = create_slide(slide_data, theme, width, height, slide_type, font_path,
+                       cache_dir, slide_cache_mb, output_scale)
+    _save_slide(img, path, slide_format, png_compress_level)
+    return path
+
+
+def _run_slide_jobs(jobs: list, func, job_args: list, workers: int, font_path: str) -> list:
+    """
+    슬라이드 작업을 순차 또는 프로세스 풀로 실행하고 결과를 작업 순서대로 반환합니다.
+
+    Args:
+        jobs: _slide_jobs()가 만든 작업 목록 (라벨 출력용)
+        func: 작업마다 호출할 함수 (워커에서 실행되므로 모듈 최상위 함수여야 함)
+        job_args: 작업별 func 인자 튜플 리스트
+        workers: 병렬 렌더링 프로세스 수 (1이면 순차, 0이면 CPU 코어 수)
+        font_path: 워커에서 미리 로드할 폰트 경로
+    """
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+
+    if workers <= 1:
+        results = []
+        for (label, _, _), args in zip(jobs, job_args):
+            print(f"  🎨 {label} 생성 중...")
+            results.append(func(*args))
+        return results
+
+    print(f"  ⚡ {workers}개 프로세스로 병렬 렌더링")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_render_worker,
+        initargs=(font_path,),
+    ) as executor:
+        futures = []
+        for (label, _, _), args in zip(jobs, job_args):
+            print(f"  🎨 {label} 생성 중...")
+            futures.append(executor.submit(func, *args))
+        # 제출 순서대로 결과 수집 (예외가 있으면 여기서 전파)
+        return [future.result() for future in futures]
+
+
+def render_slides(content: dict, theme: dict, width: int = 1080, height: int = 1920,
+                  font_path: str = None, cache_dir: str = None, workers: int = 1,
+                  slide_cache_mb: int = SLIDE_CACHE_MB, output_scale: float = 1.0) -> list:
+    """
+    모든 슬라이드를 파일로 저장하지 않고 메모리에서 렌더링합니다.
+
+    결과 이미지는 create_video에 그대로 넘기면 ffmpeg stdin으로 전달되어
+    임시 이미지 파일 없이 영상이 만들어집니다.
+
+    Args:
+        content: Gemini가 생성한 콘텐츠 딕셔너리
+        theme: 테마 설정
+        width: 이미지 너비
+        height: 이미지 높이
+        font_path: 커스텀 폰트 경로
+        cache_dir: 배경/슬라이드 디스크 캐시 디렉토리
+        workers: 병렬 렌더링 프로세스 수 (1이면 순차, 0이면 CPU 코어 수)
+        slide_cache_mb: 슬라이드 디스크 캐시 최대 크기 (MB)
+        output_scale: 결과 이미지 배율 (미리보기용)
+
+    Returns:
+        PIL Image 리스트 (인트로, 콘텐츠..., 아웃트로 순서)
+    """
+    if not font_path:
+        font_path = _ensure_font()
+
+    jobs = _slide_jobs(content)
+    job_args = [
+        (slide_data, theme, width, height, slide_type, font_path, cache_dir,
+         slide_cache_mb, output_scale)
+        for _, slide_data, slide_type in jobs
+    ]
+    slides = _run_slide_jobs(jobs, create_slide, job_args, workers, font_path)
+
+    print(f"  ✅ 총 {len(slides)}장의 슬라이드 생성 완료! (메모리)")
+    return slides
+
+
 def generate_slides(content: dict, theme: dict, width: int = 1080, height: int = 1920,
-                    font_path: str = None, output_dir: str = "output") -> list:
+                    font_path: str = None, output_dir: str = "output",
+                    cache_dir: str = None, workers: int = 1,
+                    slide_format: str = "png", png_compress_level: int = 6,
+                    slide_cache_mb: int = SLIDE_CACHE_MB, output_scale: float = 1.0) -> list:
     """
     콘텐츠 데이터로부터 모든 슬라이드 이미지를 생성합니다.
 
@@ -398,47 +868,36 @@ def generate_slides(content: dict, theme: dict, width: int = 1080, height: int =
         height: 이미지 높이
         font_path: 커스텀 폰트 경로
         output_dir: 이미지 저장 디렉토리
+        cache_dir: 배경/슬라이드 디스크 캐시 디렉토리
+        workers: 병렬 렌더링 프로세스 수 (1이면 순차, 0이면 CPU 코어 수)
+        slide_format: 중간 이미지 포맷 (png, bmp, ppm, raw)
+        png_compress_level: PNG 압축 레벨 (0~9, 0은 무압축)
+        slide_cache_mb: 슬라이드 디스크 캐시 최대 크기 (MB)
+        output_scale: 결과 이미지 배율 (미리보기용)
 
     Returns:
-        생성된 이미지 파일 경로 리스트
+        생성된 이미지 파일 경로 리스트 (인트로, 콘텐츠..., 아웃트로 순서)
     """
+    if slide_format not in SLIDE_FORMATS:
+        raise ValueError(f"지원하지 않는 슬라이드 포맷: {slide_format} "
+                         f"(가능: {', '.join(SLIDE_FORMATS)})")
+
     temp_dir = os.path.join(output_dir, "_temp_slides")
     os.makedirs(temp_dir, exist_ok=True)
 
-    slide_paths = []
-    slide_index = 0
-
-    # 1. 인트로 슬라이드
-    print("  🎨 인트로 슬라이드 생성 중...")
-    intro_img = create_slide(
-        {"intro_title": content.get("intro_title", "")},
-        theme, width, height, "intro", font_path
-    )
-    path = os.path.join(temp_dir, f"slide_{slide_index:03d}.png")
-    intro_img.save(path, "PNG")
-    slide_paths.append(path)
-    slide_index += 1
+    # 폰트 다운로드는 워커 시작 전에 한 번만
+    if not font_path:
+        font_path = _ensure_font()
 
-    # 2. 콘텐츠 슬라이드
-    for i, slide_data in enumerate(content.get("slides", [])):
-        print(f"  🎨 콘텐츠 슬라이드 {i+1} 생성 중...")
-        content_img = create_slide(
-            slide_data, theme, width, height, "content", font_path
-        )
-        path = os.path.join(temp_dir, f"slide_{slide_index:03d}.png")
-        content_img.save(path, "PNG")
-        slide_paths.append(path)
-        slide_index += 1
-
-    # 3. 아웃트로 슬라이드
-    print("  🎨 아웃트로 슬라이드 생성 중...")
-    outro_img = create_slide(
-        {"outro_text": content.get("outro_text", "다음에 또 만나요!")},
-        theme, width, height, "outro", font_path
-    )
-    path = os.path.join(temp_dir, f"slide_{slide_index:03d}.png")
-    outro_img.save(path, "PNG")
-    slide_paths.append(path)
+    jobs = _slide_jobs(content)
+    out_width, out_height = scaled_size(width, height, output_scale)
+    job_args = [
+        (slide_data, theme, width, height, slide_type, font_path, cache_dir,
+         os.path.join(temp_dir, _slide_filename(index, out_width, out_height, slide_format)),
+         slide_format, png_compress_level, slide_cache_mb, output_scale)
+        for index, (_, slide_data, slide_type) in enumerate(jobs)
+    ]
+    slide_paths = _run_slide_jobs(jobs, _render_slide_to_file, job_args, workers, font_path)
 
     print(f"  ✅ 총 {len(slide_paths)}장의 슬라이드 생성 완료!")
     return slide_paths
@@ -8,11 +8,14 @@ Gemini API를 활용한 숏츠 영상 자동 생성기
     python main.py --type knowledge      # 오늘의 상식
     python main.py --type motivation     # 동기부여
     python main.py --type custom --topic "파이썬 꿀팁"  # 커스텀
+    python main.py --type quote --preview  # 저해상도 빠른 미리보기
 """
 
 import os
 import sys
+import shutil
 import argparse
+import tempfile
 from datetime import datetime
 
 # Windows 콘솔 UTF-8 인코딩 설정 (이모지 출력 지원)
@@ -23,9 +26,10 @@ if sys.platform == "win32":
 import yaml
 
 from content_generator import generate_content
-from image_generator import generate_slides
+from image_generator import generate_slides, render_slides, scaled_size
+from scratch import pick_scratch_dir, estimate_job_bytes
 from tts_generator import generate_all_tts, resolve_voice, VOICES
-from video_generator import create_video
+from video_generator import create_video, clip_durations
 
 
 def load_config(config_path: str = "config.yaml") -> dict:
@@ -73,6 +77,7 @@ def main():
   python main.py --type knowledge          오늘의 상식 영상 생성
   python main.py --type motivation         동기부여 영상 생성
   python main.py --type custom --topic "AI 트렌드"   커스텀 주제
+  python main.py --type quote --preview    저해상도 빠른 미리보기
         """
     )
     parser.add_argument(
@@ -93,6 +98,11 @@ def main():
         default="config.yaml",
         help="설정 파일 경로 (기본: config.yaml)"
     )
+    parser.add_argument(
+        "--preview",
+        action="store_true",
+        help="저해상도/저fps/ultrafast로 빠르게 미리보기 렌더링 (config.yaml의 preview 설정)"
+    )
     
     args = parser.parse_args()
     
@@ -122,6 +132,7 @@ def main():
     fps = video_config.get("fps", 30)
     slide_duration = video_config.get("slide_duration", 5)
     transition_duration = video_config.get("transition_duration", 0.5)
+    transition = video_config.get("transition", "black")
     
     # TTS 설정
     tts_config = config.get("tts", {})
@@ -138,11 +149,45 @@ def main():
     output_config = config.get("output", {})
     output_dir = output_config.get("directory", "output")
     filename_prefix = output_config.get("filename_prefix", "shorts")
+    renditions = output_config.get("renditions") or []
+    output_format = output_config.get("format", "mp4")
     
     # 폰트 설정
     font_config = config.get("font", {})
     custom_font = font_config.get("custom_font", None)
     
+    # 캐시 설정
+    cache_config = config.get("cache", {})
+    cache_dir = cache_config.get("directory", None)
+    slide_cache_mb = cache_config.get("slide_cache_mb", 512)
+    clip_cache_mb = cache_config.get("clip_cache_mb", 1024)
+    
+    # 렌더링 성능 설정
+    render_config = config.get("render", {})
+    render_workers = render_config.get("workers", 1)
+    slide_format = render_config.get("slide_format", "png")
+    png_compress_level = render_config.get("png_compress_level", 6)
+    in_memory_slides = render_config.get("in_memory_slides", False)
+    video_mode = render_config.get("video_mode", "clips")
+    cpu_budget = render_config.get("cpu_budget", 0)
+    motion_engine = render_config.get("motion_engine", "zoompan")
+    intermediate_codec = render_config.get("intermediate_codec", "h264")
+    scratch_dir = render_config.get("scratch_dir", "auto")
+    scratch_max_mb = render_config.get("scratch_max_mb", 1024)
+    
+    # 미리보기 설정 (--preview): 같은 파이프라인을 축소 해상도로 실행
+    output_scale = 1.0
+    x264_preset = None
+    ken_burns = True
+    if args.preview:
+        preview_config = config.get("preview", {})
+        output_scale = preview_config.get("scale", 0.5)
+        fps = preview_config.get("fps", 15)
+        x264_preset = preview_config.get("preset", "ultrafast")
+        ken_burns = preview_config.get("ken_burns", False)
+        renditions = []  # 미리보기는 주 출력만
+    video_width, video_height = scaled_size(width, height, output_scale)
+    
     # 테마 로드
     theme = load_theme(args.type)
     
@@ -155,7 +200,7 @@ def main():
     }
     
     print(f"📌 콘텐츠 유형: {content_type_names[args.type]}")
-    print(f"📐 해상도: {width}x{height}")
+    print(f"📐 해상도: {video_width}x{video_height}" + (" (미리보기)" if args.preview else ""))
     print(f"🔊 TTS: {'ON' if tts_enabled else 'OFF'}")
     print(f"🎵 BGM: {'ON' if bgm_enabled else 'OFF'}")
     print()
@@ -174,59 +219,135 @@ def main():
     
     print()
     
-    # 3. 슬라이드 이미지 생성 (Pillow)
-    print("🎨 슬라이드 이미지 생성 중...")
-    try:
-        slide_paths = generate_slides(
-            content=content,
-            theme=theme,
-            width=width,
-            height=height,
-            font_path=custom_font,
-            output_dir=output_dir,
-        )
-    except Exception as e:
-        print(f"❌ 슬라이드 생성 실패: {e}")
-        sys.exit(1)
-    
-    print()
+    # 작업별 작업 공간: 슬라이드/TTS/클립 임시 파일을 이 안에만 만들고 끝나면 통째로 정리
+    # (같은 출력 디렉토리로 여러 작업을 동시에 돌려도 서로의 파일을 건드리지 않음)
+    # 메모리(/dev/shm 등)에 여유가 있으면 그곳에 만들어 중간 파일의 디스크 읽기/쓰기를 없앰
+    today = datetime.now().strftime("%Y%m%d")
+    os.makedirs(output_dir, exist_ok=True)
+    slide_count = len(content.get("slides", [])) + 2  # 인트로 + 본문 + 아웃트로
+    scratch_max_bytes = scratch_max_mb * 1024 * 1024 if scratch_max_mb else None
+    # TTS 전이라 슬라이드 길이는 최소값(slide_duration)으로 추정 (TTS 후 다시 확인)
+    job_bytes = estimate_job_bytes(
+        [slide_duration] * slide_count, video_width, video_height, fps, intermediate_codec,
+    )
+    scratch_root = pick_scratch_dir(output_dir, scratch_dir, job_bytes, scratch_max_bytes)
+    job_prefix = f"_job_{today}_{args.type}_"
+    workspace = tempfile.mkdtemp(prefix=job_prefix, dir=scratch_root)
+    if scratch_root != output_dir:
+        print(f"💾 작업 공간: {workspace}")
+    job_id = os.path.basename(workspace).lstrip("_")
+    job_suffix = os.path.basename(workspace)[len(job_prefix):]  # mkdtemp가 붙인 고유 문자열
+    video_workspace = workspace  # 클립/완성 전 영상을 만들 곳
     
-    # 4. TTS 생성 (edge-tts)
-    tts_data = None
-    if tts_enabled:
-        print("🔊 TTS 나레이션 생성 중...")
+    try:
+        # 3. 슬라이드 이미지 생성 (Pillow)
+        print("🎨 슬라이드 이미지 생성 중...")
         try:
-            voice = resolve_voice(tts_voice)
-            tts_data = generate_all_tts(
-                content=content,
-                voice=voice,
-                rate=tts_rate,
-                output_dir=output_dir,
-            )
+            if in_memory_slides:
+                # 임시 이미지 파일 없이 ffmpeg로 바로 전달
+                slide_paths = render_slides(
+                    content=content,
+                    theme=theme,
+                    width=width,
+                    height=height,
+                    font_path=custom_font,
+                    cache_dir=cache_dir,
+                    workers=render_workers,
+                    slide_cache_mb=slide_cache_mb,
+                    output_scale=output_scale,
+                )
+            else:
+                slide_paths = generate_slides(
+                    content=content,
+                    theme=theme,
+                    width=width,
+                    height=height,
+                    font_path=custom_font,
+                    output_dir=workspace,
+                    cache_dir=cache_dir,
+                    workers=render_workers,
+                    slide_format=slide_format,
+                    png_compress_level=png_compress_level,
+                    slide_cache_mb=slide_cache_mb,
+                    output_scale=output_scale,
+                )
         except Exception as e:
-            print(f"⚠️  TTS 생성 실패 (나레이션 없이 계속 진행): {e}")
-            tts_data = None
+            print(f"❌ 슬라이드 생성 실패: {e}")
+            sys.exit(1)
+    
         print()
     
-    # 5. 영상 합성 (ffmpeg)
-    today = datetime.now().strftime("%Y%m%d")
-    output_filename = f"{filename_prefix}_{today}_{args.type}.mp4"
-    output_path = os.path.join(output_dir, output_filename)
+        # 4. TTS 생성 (edge-tts)
+        tts_data = None
+        if tts_enabled:
+            print("🔊 TTS 나레이션 생성 중...")
+            try:
+                voice = resolve_voice(tts_voice)
+                tts_data = generate_all_tts(
+                    content=content,
+                    voice=voice,
+                    rate=tts_rate,
+                    output_dir=workspace,
+                )
+            except Exception as e:
+                print(f"⚠️  TTS 생성 실패 (나레이션 없이 계속 진행): {e}")
+                tts_data = None
+            print()
     
-    try:
-        result_path = create_video(
-            slide_paths=slide_paths,
-            output_path=output_path,
-            fps=fps,
-            slide_duration=slide_duration,
-            transition_duration=transition_duration,
-            bgm_enabled=bgm_enabled,
-            bgm_volume=bgm_volume,
-            tts_data=tts_data,
-        )
-    except Exception as e:
-        print(f"❌ 영상 생성 실패: {e}")
-        sys.exit(1)
+        # 나레이션 길이를 반영한 실제 슬라이드 길이로 다시 추정해, 메모리 작업 공간에
+        # 클립이 다 들어가지 않으면 클립/완성 전 영상은 디스크에 만듦 (슬라이드/TTS는 그대로)
+        if scratch_root != output_dir and tts_data:
+            job_bytes = estimate_job_bytes(
+                clip_durations(
+                    len(slide_paths), tts_data, slide_duration, fps, transition, transition_duration,
+                ),
+                video_width, video_height, fps, intermediate_codec,
+            )
+            if pick_scratch_dir(output_dir, scratch_dir, job_bytes, scratch_max_bytes) != scratch_root:
+                video_workspace = tempfile.mkdtemp(
+                    prefix=f"_job_{today}_{args.type}_video_", dir=output_dir
+                )
+                print(f"💾 나레이션이 길어 클립은 디스크에 만듭니다: {video_workspace}")
+    
+        # 5. 영상 합성 (ffmpeg)
+        # 같은 날 같은 유형의 작업이 서로의 결과를 덮어쓰지 않도록 작업 고유 문자열을 붙임
+        preview_suffix = "_preview" if args.preview else ""
+        output_filename = f"{filename_prefix}_{today}_{args.type}_{job_suffix}{preview_suffix}.mp4"
+        output_path = os.path.join(output_dir, output_filename)
+    
+        try:
+            result_path = create_video(
+                slide_paths=slide_paths,
+                output_path=output_path,
+                fps=fps,
+                slide_duration=slide_duration,
+                transition_duration=transition_duration,
+                transition=transition,
+                bgm_enabled=bgm_enabled,
+                bgm_volume=bgm_volume,
+                tts_data=tts_data,
+                width=video_width,
+                height=video_height,
+                ken_burns=ken_burns,
+                x264_preset=x264_preset,
+                render_mode=video_mode,
+                cpu_budget=cpu_budget,
+                motion_engine=motion_engine,
+                cache_dir=cache_dir,
+                log_dir=os.path.join(output_dir, "logs", job_id),
+                workspace=video_workspace,
+                clip_cache_mb=clip_cache_mb,
+                renditions=renditions,
+                output_format=output_format,
+                intermediate_codec=intermediate_codec,
+            )
+        except Exception as e:
+            print(f"❌ 영상 생성 실패: {e}")
+            sys.exit(1)
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+        if video_workspace != workspace:
+            shutil.rmtree(video_workspace, ignore_errors=True)
     
     print()
     print("=" * 50)
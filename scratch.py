@@ -0,0 +1,131 @@
+"""
+중간 파일(슬라이드, TTS, 클립)을 둘 작업 공간 위치를 고릅니다.
+
+/dev/shm 같은 메모리 기반 파일 시스템(tmpfs)에 여유가 있으면 그곳을 쓰고,
+여유가 없거나 작업이 너무 크면 디스크(출력 디렉토리)로 돌아갑니다.
+네트워크 볼륨에서는 중간 파일을 쓰고 다시 읽는 지연이 렌더링 시간의 상당 부분을 차지합니다.
+"""
+
+import os
+import shutil
+
+
+RAM_SCRATCH_DIRS = ("/dev/shm",)    # scratch_dir: "auto"일 때 확인할 메모리 디렉토리
+RAM_FILESYSTEMS = ("tmpfs", "ramfs")
+MEMORY_HEADROOM = 0.5               # 메모리 작업 공간은 사용 가능한 RAM의 절반까지만 사용
+
+# 작업 크기 추정용 상수 (실제보다 넉넉하게)
+# 압축 코덱 클립 크기는 슬라이드 내용에 따라 크게 달라지므로 실측값에 여유 배수를 곱함
+CLIP_SIZE_HEADROOM = 10
+# 중간 코덱별 Ken Burns 클립의 비트량 (비트/픽셀/프레임)
+# 실측: 1080x1920 30fps 그라데이션 슬라이드 3초 클립 (benchmarks/bench_intermediate_codec.py)
+CLIP_BITS_PER_PIXEL = {
+    "h264": 0.01 * CLIP_SIZE_HEADROOM,            # x264 기본 CRF, 실측 약 0.01
+    "h264_lossless": 0.15 * CLIP_SIZE_HEADROOM,   # x264 -qp 0, 실측 약 0.15
+    "ffv1": 0.16 * CLIP_SIZE_HEADROOM,            # 실측 약 0.16
+    "raw": 12,                                    # yuv420p 무압축 (정확한 값이라 여유 없음)
+}
+TTS_BYTES_PER_SLIDE = 256 * 1024
+
+
+def _available_memory() -> int | None:
+    """/proc/meminfo의 MemAvailable (바이트, 알 수 없으면 None)."""
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _is_ram_backed(path: str) -> bool:
+    """path가 tmpfs/ramfs 위에 있는지 /proc/mounts로 확인합니다 (확인할 수 없으면 False)."""
+    path = os.path.realpath(path)
+    best_mount, best_type = "", None
+    try:
+        with open("/proc/mounts", encoding="utf-8") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount_point, fs_type = fields[1], fields[2]
+                inside = path == mount_point or path.startswith(mount_point.rstrip("/") + "/")
+                if inside and len(mount_point) > len(best_mount):
+                    best_mount, best_type = mount_point, fs_type
+    except OSError:
+        return False
+    return best_type in RAM_FILESYSTEMS
+
+
+def estimate_job_bytes(slide_seconds: list, width: int, height: int, fps: int,
+                       intermediate_codec: str = "h264") -> int:
+    """
+    작업 하나가 작업 공간에 동시에 두는 중간 파일 크기를 넉넉하게 추정합니다.
+
+    슬라이드(무압축 기준) + TTS + 클립, 그리고 클립을 합친 완성 전 영상까지 포함합니다.
+    slide_seconds는 슬라이드별 표시 시간입니다 (TTS가 있으면 나레이션 길이에 따라 길어짐).
+    """
+    slide_bytes = width * height * 3
+    bits_per_pixel = CLIP_BITS_PER_PIXEL.get(intermediate_codec, CLIP_BITS_PER_PIXEL["h264"])
+    # 완성 전 영상은 합치기 단계에서 최종 코덱(x264)으로 인코딩됨
+    bits_per_pixel += CLIP_BITS_PER_PIXEL["h264"]
+    video_bytes = int(width * height * fps * sum(slide_seconds) * bits_per_pixel / 8)
+    return len(slide_seconds) * (slide_bytes + TTS_BYTES_PER_SLIDE) + video_bytes
+
+
+def _has_room(path: str, needed_bytes: int) -> bool:
+    """path에 needed_bytes를 쓸 수 있는지 (디스크 여유 + 메모리 기반이면 RAM 여유) 확인합니다."""
+    if not os.path.isdir(path) or not os.access(path, os.W_OK):
+        return False
+    if shutil.disk_usage(path).free < needed_bytes:
+        return False
+    if _is_ram_backed(path):
+        available = _available_memory()
+        if available is not None and available * MEMORY_HEADROOM < needed_bytes:
+            return False
+    return True
+
+
+def pick_scratch_dir(
+    fallback_dir: str,
+    scratch_dir: str | None = "auto",
+    needed_bytes: int = 0,
+    max_bytes: int | None = None,
+) -> str:
+    """
+    작업 공간을 만들 디렉토리를 고릅니다.
+
+    Args:
+        fallback_dir: 작업 공간 디렉토리를 쓸 수 없을 때 사용할 디스크 디렉토리 (출력 디렉토리)
+        scratch_dir: "auto" (RAM_SCRATCH_DIRS 중 여유 있는 곳), 디렉토리 경로,
+                     또는 None (항상 fallback_dir)
+        needed_bytes: 작업이 작업 공간에 둘 예상 크기 (estimate_job_bytes 참조)
+        max_bytes: 작업 공간에 둘 수 있는 최대 크기 (예상 크기가 넘으면 fallback_dir,
+                   None이면 제한 없음)
+
+    Returns:
+        작업 공간을 만들 디렉토리 경로
+    """
+    if not scratch_dir:
+        return fallback_dir
+
+    if max_bytes is not None and needed_bytes > max_bytes:
+        print(f"  ⚠️  예상 중간 파일 크기({needed_bytes / (1024 * 1024):.0f} MB)가 "
+              f"작업 공간 한도를 넘어 디스크를 사용합니다.")
+        return fallback_dir
+
+    if scratch_dir == "auto":
+        candidates = RAM_SCRATCH_DIRS
+    else:
+        os.makedirs(scratch_dir, exist_ok=True)
+        candidates = (scratch_dir,)
+
+    for candidate in candidates:
+        if _has_room(candidate, needed_bytes):
+            return candidate
+
+    if scratch_dir != "auto":
+        print(f"  ⚠️  작업 공간({scratch_dir})에 여유가 없어 디스크를 사용합니다.")
+    return fallback_dir
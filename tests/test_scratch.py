@@ -0,0 +1,22 @@
+from scratch import estimate_job_bytes, pick_scratch_dir
+
+
+def test_estimate_uses_per_slide_durations():
+    short = estimate_job_bytes([5.0] * 4, 1080, 1920, 30)
+    narrated = estimate_job_bytes([5.0, 40.0, 60.0, 5.0], 1080, 1920, 30)
+    assert narrated > short * 3
+
+
+def test_estimate_scales_with_intermediate_codec():
+    assert estimate_job_bytes([5.0] * 4, 1080, 1920, 30, "raw") > \
+        estimate_job_bytes([5.0] * 4, 1080, 1920, 30, "h264") * 10
+
+
+def test_long_narration_exceeds_scratch_cap(tmp_path):
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+    cap = 256 * 1024 * 1024
+    short = estimate_job_bytes([5.0] * 5, 1080, 1920, 30)
+    long = estimate_job_bytes([5.0, 90.0, 120.0, 90.0, 5.0], 1080, 1920, 30)
+    assert pick_scratch_dir(str(tmp_path), str(scratch), short, cap) == str(scratch)
+    assert pick_scratch_dir(str(tmp_path), str(scratch), long, cap) == str(tmp_path)
@@ -0,0 +1,180 @@
+import re
+import shutil
+import subprocess
+
+import pytest
+
+from video_generator import (
+    _check_rendition,
+    _clip_length,
+    _clip_plan,
+    _output_size,
+    _parse_bitrate,
+    _remove_hls_files,
+    _rendition_output_args,
+    _xfade_filters,
+)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (2500000, 2500000),
+    ("2500000", 2500000),
+    ("2500k", 2500000),
+    ("2.5M", 2500000),
+    ("128k", 128000),
+])
+def test_parse_bitrate(value, expected):
+    assert _parse_bitrate(value) == expected
+
+
+@pytest.mark.parametrize("value", ["fast", "2.5G", "", "0k", "-1M"])
+def test_parse_bitrate_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        _parse_bitrate(value)
+
+
+@pytest.mark.parametrize("bitrate", [2500000, "2500k", "2.5M"])
+def test_rendition_bitrate_args(bitrate):
+    rendition = {"name": "720p", "width": 720, "height": 1280, "video_bitrate": bitrate}
+    args = _rendition_output_args(rendition, "[rv0]", "[ra0]", 30, None, "out_720p.mp4")
+    assert args[args.index("-b:v") + 1] == "2500000"
+    assert args[args.index("-maxrate") + 1] == "2500000"
+    assert args[args.index("-bufsize") + 1] == "5000000"
+    assert args[args.index("-b:a") + 1] == "128000"
+
+
+@pytest.mark.parametrize("key, value", [
+    ("video_bitrate", "fast"),
+    ("audio_bitrate", "64kbps"),
+    ("crf", "high"),
+    ("crf", -1),
+])
+def test_check_rendition_names_bad_rendition(key, value):
+    rendition = {"name": "720p", "width": 720, "height": 1280, key: value}
+    with pytest.raises(ValueError, match="720p"):
+        _check_rendition(rendition)
+
+
+def test_check_rendition_accepts_valid():
+    _check_rendition({
+        "name": "360p", "width": 360, "height": 640,
+        "video_bitrate": "2.5M", "audio_bitrate": 64000, "crf": 23,
+    })
+
+
+def test_create_video_rejects_bad_rendition_before_encoding(tmp_path, monkeypatch):
+    import video_generator
+
+    monkeypatch.setattr(video_generator, "probe_ffmpeg", lambda cache_dir=None: {
+        "version": "7.0", "filters": [], "encoders": ["libx264"], "hwaccels": [], "ffprobe": False,
+    })
+    monkeypatch.setattr(video_generator, "_run_ffmpeg", lambda *args, **kwargs: pytest.fail("encoded"))
+    with pytest.raises(ValueError, match="720p"):
+        video_generator.create_video(
+            ["slide.png"], str(tmp_path / "out.mp4"),
+            renditions=[{"name": "720p", "width": 720, "height": 1280, "video_bitrate": "fast"}],
+        )
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_hls_size_counts_listed_segments_only(tmp_path):
+    playlist = tmp_path / "out.m3u8"
+    playlist.write_text(
+        '#EXTM3U\n#EXT-X-MAP:URI="out_init.mp4"\n#EXTINF:2.0,\nout_00000.m4s\n'
+        '#EXTINF:1.0,\nout_00001.m4s\n#EXT-X-ENDLIST\n'
+    )
+    for name, size in [("out_init.mp4", 100), ("out_00000.m4s", 1000), ("out_00001.m4s", 500),
+                       ("out_00002.m4s", 7000), ("out_720p_00000.m4s", 9000)]:
+        (tmp_path / name).write_bytes(b"\0" * size)
+    assert _output_size(str(playlist), "hls") == playlist.stat().st_size + 1600
+
+
+def test_remove_hls_files_keeps_rendition_segments(tmp_path):
+    for name in ["out_init.mp4", "out_00000.m4s", "out_00012.m4s",
+                 "out_720p_init.mp4", "out_720p_00000.m4s", "other_00000.m4s"]:
+        (tmp_path / name).write_bytes(b"")
+    _remove_hls_files(str(tmp_path / "out.m3u8"))
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "other_00000.m4s", "out_720p_00000.m4s", "out_720p_init.mp4",
+    ]
+
+
+@pytest.mark.parametrize("stderr, later_motion", [
+    ("No space left on device", True),
+    ("[AVFilterGraph @ 0x0] No such filter: 'zoompan'", False),
+])
+def test_motion_failure_falls_back_per_slide(monkeypatch, stderr, later_motion):
+    import threading
+
+    import video_generator
+
+    jobs = []
+
+    def fake_run(cmd, job, *args, **kwargs):
+        jobs.append(job)
+        failed = job == "clip_000"
+        return subprocess.CompletedProcess(cmd, 1 if failed else 0, stderr=stderr if failed else "")
+
+    monkeypatch.setattr(video_generator, "_run_ffmpeg", fake_run)
+    motion_failed, motion_fallbacks = threading.Event(), set()
+    for i in range(2):
+        assert video_generator._create_slide_clip(
+            "slide.png", f"clip_{i}.mp4", 2.0, 15, 0.5, slide_index=i,
+            motion_failed=motion_failed, motion_fallbacks=motion_fallbacks,
+        )
+    assert motion_failed.is_set() is not later_motion
+    assert motion_fallbacks == ({0} if later_motion else {0, 1})
+    assert jobs[:2] == ["clip_000", "clip_000_fallback"]
+
+
+@pytest.mark.parametrize("fps", [15, 24, 30])
+@pytest.mark.parametrize("transition_duration", [0.3, 0.5, 1.0, 1.7])
+def test_acrossfade_overlaps_only_trailing_silence(fps, transition_duration):
+    tts_data = [{"path": f"tts_{i}.mp3", "duration": duration}
+                for i, duration in enumerate([2.03, 3.51, 1.97, 4.26])]
+    plan = _clip_plan(len(tts_data), tts_data, 2.0, fps, "fade", transition_duration)
+    labels = [f"[a{i}]" for i in range(len(plan))]
+    filters, _, _ = _xfade_filters(labels, labels, plan, fps, "fade", transition_duration)
+    crossfades = [float(re.search(r"acrossfade=d=([\d.]+)", f).group(1))
+                  for f in filters if "acrossfade" in f]
+    assert len(crossfades) == len(plan) - 1
+    for k, fade_seconds in enumerate(crossfades):
+        # acrossfade는 앞 슬라이드 오디오(클립 길이)의 마지막 fade_seconds와 겹침
+        overlap_start = _clip_length(plan[k][0], fps) - fade_seconds
+        assert overlap_start >= tts_data[k]["duration"]
+
+
+def _frame_count(path: str) -> int:
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-i", path, "-map", "0:v", "-f", "null", "-"],
+        capture_output=True, text=True, check=True,
+    )
+    return int(re.findall(r"frame=\s*(\d+)", result.stderr)[-1])
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg가 필요합니다")
+@pytest.mark.parametrize("motion_engine", ["zoompan", "crop"])
+def test_xfade_frame_count_matches_between_modes(tmp_path, motion_engine):
+    from PIL import Image
+
+    import video_generator
+
+    slides = []
+    for i, color in enumerate(["#0f0c29", "#b21f1f", "#71B280", "#FFD700"]):
+        slides.append(str(tmp_path / f"slide_{i}.png"))
+        Image.new("RGB", (180, 320), color).save(slides[-1])
+
+    fps, slide_duration, transition_duration = 15, 2.0, 0.5
+    counts = {}
+    for render_mode in ("clips", "single"):
+        output = video_generator.create_video(
+            slides, str(tmp_path / render_mode / "out.mp4"), fps=fps,
+            slide_duration=slide_duration, transition_duration=transition_duration,
+            width=180, height=320, x264_preset="ultrafast", render_mode=render_mode,
+            motion_engine=motion_engine, transition="fade", workspace=str(tmp_path),
+        )
+        counts[render_mode] = _frame_count(output)
+
+    fade_frames = int(fps * transition_duration)
+    expected = len(slides) * int(fps * slide_duration) - (len(slides) - 1) * fade_frames
+    assert counts == {"clips": expected, "single": expected}
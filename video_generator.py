@@ -4,21 +4,25 @@ TTS 오디오가 제공되면 나레이션이 포함된 영상을 생성합니
 """
 
 import os
+import re
+import errno
 import glob
+import json
+import hashlib
 import subprocess
 import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from PIL import Image
 
-def _check_ffmpeg() -> bool:
-    """ffmpeg가 설치되어 있는지 확인합니다."""
-    try:
-        result = subprocess.run(
-            ["ffmpeg", "-version"], 
-            capture_output=True, text=True, timeout=10
-        )
-        return result.returncode == 0
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        return False
+from ffmpeg_caps import probe_ffmpeg, has_filters, has_encoder, version_at_least
+
+
+# raw 슬라이드 파일명 규칙 (image_generator._slide_filename 참조)
+RAW_SLIDE_PATTERN = re.compile(r"_(\d+)x(\d+)\.rgb$")
 
 
 def _find_bgm(bgm_dir: str = "assets/bgm") -> str | None:
@@ -35,26 +39,236 @@ def _find_bgm(bgm_dir: str = "assets/bgm") -> str | None:
     return None
 
 
+# generate_slides / generate_all_tts가 출력(작업) 디렉토리 아래에 만드는 임시 디렉토리
+INPUT_TEMP_DIRS = ("_temp_slides", "_temp_tts")
+
+# ffmpeg -progress 출력에서 보고할 항목
+PROGRESS_KEYS = ("frame", "fps", "speed", "out_time_us")
+LOG_TAIL_BYTES = 4000  # 실패 시 에러 메시지로 돌려줄 로그 끝부분 크기
+
+
+def _parse_progress(key: str, value: str):
+    """-progress 값 하나를 숫자로 바꿉니다 (N/A면 None)."""
+    value = value.strip().rstrip("x")
+    try:
+        return float(value) if key in ("fps", "speed") else int(value)
+    except ValueError:
+        return None
+
+
+def _feed_stdin(pipe, data):
+    """stdin 데이터(bytes 또는 bytes 이터러블)를 별도 스레드에서 ffmpeg로 보냅니다."""
+    try:
+        if isinstance(data, bytes):
+            pipe.write(data)
+        else:
+            for chunk in data:
+                pipe.write(chunk)
+    except (BrokenPipeError, OSError):
+        pass  # ffmpeg가 먼저 끝남 (에러는 종료 코드/로그로 확인)
+    finally:
+        try:
+            pipe.close()
+        except OSError:
+            pass
+
+
+def _run_ffmpeg(
+    cmd: list,
+    job: str,
+    log_dir: str | None = None,
+    input_data=None,
+    on_progress=None,
+) -> subprocess.CompletedProcess:
+    """
+    ffmpeg를 실행하면서 -progress 출력을 읽어 진행 상황을 보고합니다.
+
+    stderr는 파이썬 문자열에 쌓지 않고 log_dir/<job>.log 파일로 바로 씁니다
+    (log_dir이 없으면 임시 파일). 작업이 끝나면 마지막 진행 상황을
+    log_dir/metrics.jsonl에 한 줄씩 추가해 호스트/버전별 인코딩 속도를 비교할 수 있습니다.
+
+    Args:
+        cmd: "ffmpeg"로 시작하는 명령 (-progress 옵션은 여기서 추가)
+        job: 작업 이름 (로그 파일명, 콜백 구분용)
+        log_dir: 작업별 로그/메트릭 디렉토리
+        input_data: stdin으로 보낼 bytes 또는 bytes 이터러블 (프레임 스트리밍)
+        on_progress: on_progress(job, stats) 콜백. stats는 frame, fps, speed,
+                     out_time(초), elapsed(초) dict이며, 클립 병렬 인코딩 중에는
+                     여러 스레드에서 호출됩니다.
+
+    Returns:
+        CompletedProcess (stderr는 로그 끝부분, progress 속성에 마지막 stats)
+    """
+    cmd = [cmd[0], "-progress", "pipe:1", "-nostats", *cmd[1:]]
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+        log_file = open(os.path.join(log_dir, f"{job}.log"), "w+b")
+    else:
+        log_file = tempfile.TemporaryFile()
+
+    stats = {}
+    start = time.perf_counter()
+    with log_file:
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if input_data is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=log_file,
+        )
+        writer = None
+        if input_data is not None:
+            writer = threading.Thread(target=_feed_stdin, args=(process.stdin, input_data), daemon=True)
+            writer.start()
+
+        for line in process.stdout:
+            key, _, value = line.decode("utf-8", errors="replace").strip().partition("=")
+            if key in PROGRESS_KEYS:
+                stats[key] = _parse_progress(key, value)
+            elif key == "progress":
+                out_time_us = stats.pop("out_time_us", None)
+                if out_time_us is not None:
+                    stats["out_time"] = out_time_us / 1_000_000
+                stats["elapsed"] = time.perf_counter() - start
+                if on_progress:
+                    on_progress(job, dict(stats))
+        returncode = process.wait()
+        if writer:
+            writer.join()
+
+        log_file.seek(max(0, log_file.seek(0, os.SEEK_END) - LOG_TAIL_BYTES))
+        stderr_tail = log_file.read().decode("utf-8", errors="replace")
+
+    stats["elapsed"] = time.perf_counter() - start
+    if log_dir:
+        with open(os.path.join(log_dir, "metrics.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps({"job": job, "returncode": returncode, **stats}) + "\n")
+
+    result = subprocess.CompletedProcess(cmd, returncode, stdout=None, stderr=stderr_tail)
+    result.progress = stats
+    return result
+
+
+def _image_input_args(slide, loop: bool = False) -> list:
+    """
+    슬라이드 이미지를 읽기 위한 ffmpeg 입력 옵션을 만듭니다.
+
+    PNG/BMP/PPM은 image2 demuxer가 자동 인식하고,
+    raw(.rgb)는 파일명에 들어 있는 해상도로 rawvideo 입력을 지정합니다.
+    메모리 슬라이드(PIL Image)는 stdin(pipe:0)으로 rawvideo를 받습니다.
+    stdin은 되감을 수 없으므로 이때 loop는 무시되며, 호출자가 loop 필터를 써야 합니다.
+    """
+    if isinstance(slide, Image.Image):
+        return ["-f", "rawvideo", "-pix_fmt", "rgb24",
+                "-video_size", f"{slide.width}x{slide.height}", "-i", "pipe:0"]
+
+    match = RAW_SLIDE_PATTERN.search(slide)
+    if match:
+        args = ["-f", "rawvideo", "-pix_fmt", "rgb24",
+                "-video_size", f"{match.group(1)}x{match.group(2)}"]
+        if loop:
+            args += ["-stream_loop", "-1"]
+        return args + ["-i", slide]
+
+    if loop:
+        return ["-loop", "1", "-i", slide]
+    return ["-i", slide]
+
+
+def _slide_stdin(slide) -> bytes | None:
+    """메모리 슬라이드면 ffmpeg stdin으로 보낼 RGB24 바이트를, 파일이면 None을 반환합니다."""
+    if isinstance(slide, Image.Image):
+        return slide.convert("RGB").tobytes()
+    return None
+
+
+# Ken Burns 모션 엔진
+#   zoompan: zoompan 필터 (프레임별 표현식, 단일 스레드라 가장 느림)
+#   crop:    한 프레임을 yuv420p로 바꾼 뒤 loop + 프레임별 scale + 가운데 crop
+#            (변환은 한 번만, 이후 필터는 ffmpeg 슬라이스 스레드 사용)
+#   pillow:  Pillow 아핀 리사이즈(서브픽셀 box)로 프레임을 직접 만들어 stdin으로 전달
+MOTION_ENGINES = ("zoompan", "crop", "pillow")
+
+# 모션 엔진별로 ffmpeg에 있어야 하는 필터
+MOTION_ENGINE_FILTERS = {
+    "zoompan": ("zoompan", "fade"),
+    "crop": ("scale", "format", "loop", "setpts", "crop", "fade"),
+    "pillow": ("fade",),
+}
+
+# Ken Burns 필터 그래프 자체가 안 되는 ffmpeg에서 나오는 오류
+# (TTS 파일 오류, 디스크 부족 등 슬라이드 하나의 실패와 구분해 이후 슬라이드까지 fallback)
+MOTION_FILTER_ERRORS = re.compile(
+    r"No such filter|Error applying option|Error (?:re)?initializing (?:a (?:simple|complex) )?filter"
+    r"|Failed to configure"
+)
+
+# 줌 범위: 줌인 1.0 → 1.15 / 줌아웃 1.15 → 1.0
+KEN_BURNS_ZOOM = 0.15
+
+
+def _zoom_factor(frame: int, total_frames: int, slide_index: int) -> float:
+    """frame번째 프레임의 줌 배율 (짝수 슬라이드는 줌인, 홀수는 줌아웃)."""
+    progress = min(frame / total_frames, 1.0)
+    if slide_index % 2 == 0:
+        return 1 + KEN_BURNS_ZOOM * progress
+    return 1 + KEN_BURNS_ZOOM * (1 - progress)
+
+
+def _fade_filter(
+    fps: int, duration: float, transition_duration: float, fades: tuple = (True, True),
+) -> str:
+    """클립 앞뒤 페이드 인/아웃 필터 (fades: (페이드 인, 페이드 아웃), 둘 다 없으면 null)."""
+    fade_frames = int(fps * transition_duration)
+    fade_out_start = int(fps * (duration - transition_duration))
+    parts = []
+    if fades[0]:
+        parts.append(f"fade=in:0:{fade_frames}")
+    if fades[1]:
+        parts.append(f"fade=out:{fade_out_start}:{fade_frames}")
+    return ",".join(parts) or "null"
+
+
 def _build_zoom_filter(
     width: int, height: int, fps: int, duration: float,
-    transition_duration: float, slide_index: int,
+    transition_duration: float, slide_index: int, engine: str = "zoompan",
+    fades: tuple = (True, True),
 ) -> str:
     """
     Ken Burns 효과 (줌인/줌아웃) + 페이드 필터를 생성합니다.
     슬라이드마다 줌 방향이 번갈아가며 바뀝니다.
+
+    입력은 슬라이드 한 프레임이며, engine은 "zoompan" 또는 "crop"입니다
+    ("pillow"는 필터가 아니라 프레임을 직접 만들므로 _pillow_motion_frames 참조).
+    fades는 (페이드 인, 페이드 아웃) 여부입니다 (_slide_fades 참조).
     """
     total_frames = int(fps * duration)
-    fade_frames = int(fps * transition_duration)
-    fade_out_start = int(fps * (duration - transition_duration))
+    fades = _fade_filter(fps, duration, transition_duration, fades)
+
+    if engine == "crop":
+        if slide_index % 2 == 0:
+            zoom_expr = f"(1+{KEN_BURNS_ZOOM}*n/{total_frames})"
+        else:
+            zoom_expr = f"({1 + KEN_BURNS_ZOOM}-{KEN_BURNS_ZOOM}*n/{total_frames})"
+        # yuv420p 크로마 정렬을 위해 짝수 크기로 확대한 뒤 가운데를 잘라냄
+        scaled_w = f"2*trunc({width}*{zoom_expr}/2)"
+        scaled_h = f"2*trunc({height}*{zoom_expr}/2)"
+        return (
+            f"scale={width}:{height},format=yuv420p,"
+            f"loop=loop={total_frames - 1}:size=1:start=0,"
+            f"settb=1/{fps},setpts=N/({fps}*TB),"
+            f"scale=w='{scaled_w}':h='{scaled_h}':eval=frame,"
+            # crop의 iw/ih는 첫 프레임 크기로 고정되므로 오프셋도 같은 식으로 계산
+            f"crop={width}:{height}:'({scaled_w}-{width})/2':'({scaled_h}-{height})/2',"
+            f"{fades}"
+        )
 
     # 이미지를 약간 크게 확대해서 줌 여유 공간 확보
-    # 줌인: 1.0 → 1.15 / 줌아웃: 1.15 → 1.0
     if slide_index % 2 == 0:
         # 줌인 (천천히 확대)
-        zoom_expr = f"min(1+0.15*on/{total_frames},1.15)"
+        zoom_expr = f"min(1+{KEN_BURNS_ZOOM}*on/{total_frames},{1 + KEN_BURNS_ZOOM})"
     else:
         # 줌아웃 (천천히 축소)
-        zoom_expr = f"max(1.15-0.15*on/{total_frames},1.0)"
+        zoom_expr = f"max({1 + KEN_BURNS_ZOOM}-{KEN_BURNS_ZOOM}*on/{total_frames},1.0)"
 
     # zoompan: 원본 이미지를 줌하면서 가운데 유지
     zoompan = (
@@ -66,89 +280,1347 @@ def _build_zoom_filter(
         f":fps={fps}"
     )
 
-    fade_in = f"fade=in:0:{fade_frames}"
-    fade_out = f"fade=out:{fade_out_start}:{fade_frames}"
+    return f"{zoompan},{fades}"
+
+
+def _load_slide_image(slide, width: int, height: int) -> Image.Image:
+    """슬라이드(파일 경로/raw 파일/PIL Image)를 width x height RGB 이미지로 읽습니다."""
+    if isinstance(slide, Image.Image):
+        img = slide.convert("RGB")
+    else:
+        match = RAW_SLIDE_PATTERN.search(slide)
+        if match:
+            with open(slide, "rb") as f:
+                size = (int(match.group(1)), int(match.group(2)))
+                img = Image.frombytes("RGB", size, f.read())
+        else:
+            with Image.open(slide) as opened:
+                img = opened.convert("RGB")
+    if img.size != (width, height):
+        img = img.resize((width, height), Image.LANCZOS)
+    return img
+
+
+def _pillow_motion_frames(
+    image: Image.Image, width: int, height: int, total_frames: int, slide_index: int,
+):
+    """
+    Pillow 모션 엔진: 프레임마다 줌 영역(box)을 서브픽셀 단위로 잘라
+    width x height로 리사이즈한 RGB24 바이트를 차례로 돌려줍니다.
+    """
+    for frame in range(total_frames):
+        zoom = _zoom_factor(frame, total_frames, slide_index)
+        box_w = image.width / zoom
+        box_h = image.height / zoom
+        left = (image.width - box_w) / 2
+        top = (image.height - box_h) / 2
+        yield image.resize(
+            (width, height), Image.BILINEAR, box=(left, top, left + box_w, top + box_h)
+        ).tobytes()
+
+
+def _x264_args(
+    preset: str | None = None, threads: int | None = None, keyint: int | None = None,
+) -> list:
+    """
+    libx264 인코더 옵션을 만듭니다.
+
+    Args:
+        preset: x264 preset (None이면 x264 기본값 사용)
+        threads: 인코더 스레드 수 (None이면 ffmpeg/x264가 자동 결정)
+        keyint: 최대 키프레임 간격 (프레임 수, None이면 x264 기본값 250)
+    """
+    args = ["-c:v", "libx264"]
+    if preset:
+        args += ["-preset", preset]
+    if keyint:
+        args += ["-g", str(keyint)]
+    if threads:
+        # ffmpeg 스레드 수와 x264 내부 스레드(lookahead 포함)를 함께 제한
+        lookahead_threads = max(1, threads // 2)
+        args += [
+            "-threads", str(threads),
+            "-x264-params", f"threads={threads}:lookahead-threads={lookahead_threads}",
+        ]
+    return args
+
+
+def _thread_budget(job_count: int, cpu_budget: int = 0) -> tuple:
+    """
+    전체 코어 예산을 동시에 실행할 ffmpeg 프로세스들에 나눕니다.
+
+    zoompan은 단일 스레드이므로 먼저 동시 실행 수를 늘리고,
+    남는 코어를 프로세스별 인코더 스레드로 배분합니다.
+
+    Args:
+        job_count: 인코딩할 클립 수
+        cpu_budget: 사용할 전체 코어 수 (0이면 CPU 코어 수)
+
+    Returns:
+        (동시 실행 수, 프로세스당 스레드 수)
+    """
+    if cpu_budget <= 0:
+        cpu_budget = os.cpu_count() or 1
+    concurrency = max(1, min(job_count, cpu_budget))
+    threads_per_job = max(1, cpu_budget // concurrency)
+    return concurrency, threads_per_job
+
+
+# 클립(세그먼트) 공통 파라미터 - 모든 클립이 같아야 concat 시 스트림 복사 가능
+SEGMENT_TIMESCALE = 90000
+SEGMENT_AUDIO_RATE = 48000
+
+
+def _vfr_args() -> list:
+    """
+    가변 프레임 레이트 출력 옵션 (필터가 남긴 프레임을 복제하지 않고 타임스탬프대로 기록).
+
+    -fps_mode는 ffmpeg 5.1부터 있고, 이전 버전은 -vsync를 씁니다.
+    """
+    caps = probe_ffmpeg()
+    if caps is None or version_at_least(caps, 5, 1):
+        return ["-fps_mode", "vfr"]
+    return ["-vsync", "vfr"]
+
+
+def _segment_video_args(fps: int, vfr: bool = False) -> list:
+    """
+    클립 비디오 공통 출력 옵션 (픽셀 포맷, 프레임 레이트, 타임베이스 고정).
+
+    vfr이면 -r로 프레임을 복제하지 않고 필터가 남긴 프레임의 타임스탬프를 그대로 씁니다
+    (정지 슬라이드 경로, _static_slide_filter 참조).
+    """
+    return [
+        "-pix_fmt", "yuv420p",
+        *(_vfr_args() if vfr else ["-r", str(fps)]),
+        "-video_track_timescale", str(SEGMENT_TIMESCALE),
+    ]
+
+
+def _segment_audio_args(intermediate_codec: str = "h264") -> list:
+    """
+    클립 오디오 공통 출력 옵션.
+
+    샘플레이트/채널을 고정하고, TTS 뒤를 무음으로 채워(-t로 자름) 오디오와
+    비디오 길이를 같게 맞춥니다. 그래야 클립을 이어 붙여도 싱크가 밀리지 않습니다.
+    AAC 인코더 지연(priming)은 mp4 edit list로 각 클립에서 잘려 나갑니다.
+    무손실 중간 코덱이면 오디오도 PCM으로 두고 합칠 때 한 번만 AAC로 인코딩합니다.
+    """
+    if intermediate_codec == "h264":
+        codec_args = ["-c:a", "aac", "-b:a", "192k"]
+    else:
+        codec_args = ["-c:a", "pcm_s16le"]
+    return [
+        "-af", "apad",
+        *codec_args,
+        "-ar", str(SEGMENT_AUDIO_RATE),
+        "-ac", "2",
+    ]
 
-    return f"{zoompan},{fade_in},{fade_out}"
+
+# 슬라이드 클립(중간 파일) 코덱 -> (인코더, 컨테이너 확장자)
+# h264 외에는 무손실이라 클립 인코딩이 가볍고, 손실 인코딩은 합치기 단계에서 한 번만 합니다
+INTERMEDIATE_CODECS = {
+    "h264": ("libx264", ".mp4"),            # 손실 압축, 클립을 스트림 복사로 합칠 수 있음
+    "h264_lossless": ("libx264", ".nut"),   # x264 -qp 0 -preset ultrafast
+    "ffv1": ("ffv1", ".nut"),               # FFV1 무손실 (x264 무손실보다 작고 디코딩이 빠름)
+    "raw": ("rawvideo", ".nut"),            # 무압축 (인코딩 비용 없음, 파일이 매우 큼)
+}
+CLIP_EXTENSIONS = tuple(sorted({ext for _, ext in INTERMEDIATE_CODECS.values()}))
+
+
+def _clip_video_args(
+    intermediate_codec: str, x264_preset: str | None = None,
+    threads: int | None = None, keyint: int | None = None,
+) -> list:
+    """
+    클립 비디오 인코더 옵션 (INTERMEDIATE_CODECS 참조).
+
+    h264는 최종 영상과 같은 x264 설정으로 인코딩하고(스트림 복사로 합침),
+    무손실 코덱은 x264_preset/keyint와 관계없이 가장 빠른 설정을 씁니다.
+    """
+    if intermediate_codec == "h264":
+        return _x264_args(x264_preset, threads, keyint)
+    if intermediate_codec == "h264_lossless":
+        # 무손실에서 preset은 파일 크기에만 영향을 주므로 ultrafast 고정
+        return [*_x264_args("ultrafast", threads), "-qp", "0"]
+    args = ["-c:v", INTERMEDIATE_CODECS[intermediate_codec][0]]
+    if intermediate_codec == "ffv1":
+        # level 3: 슬라이스 단위 멀티스레드 인코딩
+        args += ["-level", "3"]
+    if threads:
+        args += ["-threads", str(threads)]
+    return args
+
+
+def _clip_length(duration: float, fps: int) -> float:
+    """클립 길이를 프레임 단위로 내림합니다 (비디오/오디오 끝을 맞춰 concat 경계의 빈틈 방지)."""
+    return int(fps * duration) / fps
 
 
 def _create_slide_clip(
-    slide_path: str,
+    slide_path,
     output_path: str,
     duration: float,
     fps: int,
     transition_duration: float,
     tts_path: str | None = None,
     slide_index: int = 0,
+    width: int = 1080,
+    height: int = 1920,
+    ken_burns: bool = True,
+    x264_preset: str | None = None,
+    threads: int | None = None,
+    motion_engine: str = "zoompan",
+    motion_failed: threading.Event | None = None,
+    motion_fallbacks: set | None = None,
+    log_dir: str | None = None,
+    on_progress=None,
+    intermediate_codec: str = "h264",
+    fades: tuple = (True, True),
 ) -> bool:
-    """단일 슬라이드를 비디오 클립으로 변환합니다 (Ken Burns 효과 포함)."""
-    vf = _build_zoom_filter(1080, 1920, fps, duration, transition_duration, slide_index)
+    """
+    단일 슬라이드를 비디오 클립으로 변환합니다 (Ken Burns 효과 포함).
+
+    slide_path는 이미지 파일 경로 또는 메모리의 PIL Image입니다.
+    PIL Image면 임시 파일 없이 rawvideo로 ffmpeg stdin에 전달합니다.
+    ken_burns가 False면 zoompan 없이 바로 페이드만 적용합니다 (미리보기용).
+    motion_engine은 Ken Burns 구현 방식입니다 (MOTION_ENGINES 참조).
+    motion_failed는 클립 간에 공유하는 플래그로, Ken Burns 필터 그래프 오류
+    (MOTION_FILTER_ERRORS)로 실패하면 설정되어 이후 슬라이드는 실패할 인코딩을 반복하지 않고
+    바로 fallback으로 갑니다. 그 밖의 실패는 이 슬라이드만 fallback합니다.
+    motion_fallbacks가 주어지면 Ken Burns 대신 정지 슬라이드로 만든 slide_index를 추가합니다.
+    threads는 이 클립 인코딩에 배정된 스레드 수입니다 (_thread_budget 참조).
+    log_dir/on_progress는 _run_ffmpeg로 전달됩니다 (작업 이름: clip_<번호>).
+
+    클립은 concat demuxer로 스트림 복사할 수 있도록 같은 파라미터로 인코딩됩니다
+    (_segment_video_args / _segment_audio_args 참조).
+    intermediate_codec이 무손실 코덱이면 output_path 확장자는 .nut이어야 합니다
+    (INTERMEDIATE_CODECS 참조).
+    fades는 클립 앞뒤 페이드 여부입니다 (xfade 전환이면 합치기 단계에서 겹쳐 전환, _slide_fades 참조).
+    """
+    stdin_data = _slide_stdin(slide_path)
+    clip_length = f"{_clip_length(duration, fps):.6f}"
+    audio_args = ["-i", tts_path] if tts_path else []
+    audio_out_args = _segment_audio_args(intermediate_codec) if tts_path else []
+
+    job = f"clip_{slide_index:03d}"
+    use_motion = ken_burns and not (motion_failed and motion_failed.is_set())
+
+    if use_motion and motion_engine == "pillow":
+        if _create_pillow_motion_clip(
+            slide_path, output_path, duration, fps, transition_duration, tts_path,
+            slide_index, width, height, x264_preset, threads, log_dir, on_progress,
+            intermediate_codec, fades,
+        ):
+            return True
+    elif use_motion:
+        vf = _build_zoom_filter(
+            width, height, fps, duration, transition_duration, slide_index, motion_engine, fades
+        )
 
-    if tts_path:
         cmd = [
             "ffmpeg", "-y",
-            "-i", slide_path,
-            "-i", tts_path,
-            "-c:v", "libx264",
-            "-c:a", "aac",
-            "-b:a", "192k",
-            "-t", str(duration),
-            "-pix_fmt", "yuv420p",
-            "-vf", vf,
-            "-shortest",
+            *_image_input_args(slide_path),
+            *audio_args,
+            *_clip_video_args(intermediate_codec, x264_preset, threads),
+            *audio_out_args,
+            "-t", clip_length,
+            *_segment_video_args(fps),
+            "-vf", f"{vf},setsar=1",
             output_path,
         ]
+
+        result = _run_ffmpeg(cmd, job, log_dir, stdin_data, on_progress)
+        if result.returncode == 0:
+            return True
+        if motion_failed is not None and MOTION_FILTER_ERRORS.search(result.stderr):
+            motion_failed.set()
+
+    if use_motion:
+        job += "_fallback"  # 실패한 Ken Burns 로그는 남겨 둠
+    if ken_burns and motion_fallbacks is not None:
+        motion_fallbacks.add(slide_index)
+
+    # fallback (또는 Ken Burns 끔): 줌 없는 정지 슬라이드
+    # 페이드 구간 프레임만 fps대로 남기고 가운데는 한 프레임을 길게 보여주는 가변 프레임 레이트,
+    # 클립 전체를 GOP 하나로 묶어 인코딩
+    total_frames = int(fps * duration)
+    cmd_simple = [
+        "ffmpeg", "-y",
+        *_image_input_args(slide_path),
+        *audio_args,
+        *_clip_video_args(intermediate_codec, x264_preset, threads, keyint=total_frames),
+        *audio_out_args,
+        "-t", clip_length,
+        *_segment_video_args(fps, vfr=True),
+        "-vf", (
+            f"{_static_slide_filter(width, height, fps, duration, transition_duration, fades)},"
+            f"{_static_frame_select(fps, [duration], transition_duration)},setsar=1"
+        ),
+        output_path,
+    ]
+    result = _run_ffmpeg(cmd_simple, job, log_dir, stdin_data, on_progress)
+    return result.returncode == 0
+
+
+def _create_pillow_motion_clip(
+    slide,
+    output_path: str,
+    duration: float,
+    fps: int,
+    transition_duration: float,
+    tts_path: str | None,
+    slide_index: int,
+    width: int,
+    height: int,
+    x264_preset: str | None,
+    threads: int | None,
+    log_dir: str | None = None,
+    on_progress=None,
+    intermediate_codec: str = "h264",
+    fades: tuple = (True, True),
+) -> bool:
+    """
+    Pillow 모션 엔진으로 클립을 만듭니다.
+
+    프레임을 이 프로세스에서 만들어 rawvideo로 ffmpeg stdin에 한 장씩 흘려보내므로
+    전체 프레임을 메모리에 쌓지 않습니다. 페이드는 ffmpeg 필터로 적용합니다.
+    """
+    try:
+        image = _load_slide_image(slide, width, height)
+    except OSError:
+        return False
+
+    total_frames = int(fps * duration)
+    cmd = [
+        "ffmpeg", "-y",
+        "-f", "rawvideo", "-pix_fmt", "rgb24",
+        "-video_size", f"{width}x{height}",
+        "-framerate", str(fps),
+        "-i", "pipe:0",
+        *(["-i", tts_path] if tts_path else []),
+        *_clip_video_args(intermediate_codec, x264_preset, threads),
+        *(_segment_audio_args(intermediate_codec) if tts_path else []),
+        "-t", f"{_clip_length(duration, fps):.6f}",
+        *_segment_video_args(fps),
+        "-vf", f"{_fade_filter(fps, duration, transition_duration, fades)},setsar=1",
+        output_path,
+    ]
+    frames = _pillow_motion_frames(image, width, height, total_frames, slide_index)
+    result = _run_ffmpeg(cmd, f"clip_{slide_index:03d}", log_dir, frames, on_progress)
+    return result.returncode == 0
+
+
+def _probe_stream_params(path: str) -> list | None:
+    """
+    ffprobe로 클립의 스트림 파라미터를 읽습니다 (concat 호환성 비교용).
+
+    Returns:
+        스트림별 파라미터 튜플 리스트, ffprobe가 없거나 실패하면 None
+    """
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe", "-v", "quiet",
+                "-show_entries",
+                "stream=codec_type,codec_name,profile,width,height,pix_fmt,"
+                "sample_aspect_ratio,r_frame_rate,time_base,sample_rate,channels",
+                "-of", "json",
+                path,
+            ],
+            capture_output=True, text=True, timeout=10
+        )
+        streams = json.loads(result.stdout)["streams"]
+    except (ValueError, KeyError, subprocess.TimeoutExpired, FileNotFoundError):
+        return None
+
+    return [tuple(sorted(stream.items())) for stream in streams]
+
+
+def _resolve_motion(caps: dict, ken_burns: bool, motion_engine: str, render_mode: str) -> tuple:
+    """
+    ffmpeg 기능 확인 결과로 실제 사용할 Ken Burns 설정을 미리 고릅니다.
+
+    필요한 필터가 없으면 crop → pillow 순으로 대신하고, 모두 불가능하면 줌 효과를 끕니다.
+    single 모드는 그래프 안에서 프레임을 만들 수 없으므로 pillow 대신 crop을 씁니다.
+
+    Returns:
+        (ken_burns, motion_engine)
+    """
+    if not ken_burns:
+        return False, motion_engine
+
+    candidates = [motion_engine, "crop", "pillow"]
+    if render_mode == "single":
+        candidates = ["crop" if engine == "pillow" else engine for engine in candidates[:2]]
+
+    for engine in candidates:
+        if has_filters(caps, *MOTION_ENGINE_FILTERS[engine]):
+            if engine != motion_engine:
+                print(f"  ⚠️  {motion_engine} 모션 엔진을 쓸 수 없어 {engine}(으)로 대신합니다.")
+            return True, engine
+
+    print("  ⚠️  Ken Burns에 필요한 ffmpeg 필터가 없어 줌 효과 없이 생성합니다.")
+    return False, motion_engine
+
+
+def _segments_match(paths: list) -> bool:
+    """모든 클립의 코덱/해상도/픽셀 포맷/fps/타임베이스/오디오 포맷이 같은지 확인합니다."""
+    reference = None
+    for path in paths:
+        params = _probe_stream_params(path)
+        if not params:
+            return False
+        if reference is None:
+            reference = params
+        elif params != reference:
+            return False
+    return True
+
+
+TTS_TAIL_SECONDS = 0.5  # 나레이션 뒤 여유 무음 (초)
+
+
+def clip_durations(
+    slide_count: int, tts_data: list | None, slide_duration: float,
+    fps: int = 30, transition: str = "black", transition_duration: float = 0.5,
+) -> list:
+    """슬라이드별 표시 시간 (초, _clip_plan과 같은 규칙 - 작업 공간 크기 추정용)."""
+    plan = _clip_plan(slide_count, tts_data, slide_duration, fps, transition, transition_duration)
+    return [duration for duration, _ in plan]
+
+
+def _clip_plan(
+    slide_count: int, tts_data: list | None, slide_duration: float,
+    fps: int = 30, transition: str = "black", transition_duration: float = 0.5,
+) -> list:
+    """
+    슬라이드별 (표시 시간, TTS 경로)를 계산합니다.
+
+    TTS가 있으면 오디오 길이 + 여유 시간(최소 slide_duration)을 사용합니다.
+    xfade 전환이면 acrossfade가 앞 슬라이드 끝을 전환 길이만큼 페이드 아웃하므로,
+    여유 무음을 전환 길이보다 한 프레임 길게 잡아 나레이션이 페이드되거나 다음 슬라이드와
+    겹치지 않게 합니다 (클립 길이를 프레임 단위로 내리며 줄어드는 만큼 포함).
+    """
+    has_tts = tts_data is not None and len(tts_data) == slide_count
+    tts_tail = TTS_TAIL_SECONDS
+    if transition != "black":
+        tts_tail = max(tts_tail, transition_duration + 1 / fps)
+    plan = []
+    for i in range(slide_count):
+        if has_tts:
+            tts_info = tts_data[i]
+            # TTS 길이 + 여유 시간 (최소 slide_duration)
+            plan.append((max(tts_info["duration"] + tts_tail, slide_duration), tts_info["path"]))
+        else:
+            plan.append((slide_duration, None))
+    return plan
+
+
+def _static_slide_filter(
+    width: int, height: int, fps: int, duration: float, transition_duration: float,
+    fades: tuple = (True, True),
+) -> str:
+    """
+    한 프레임 입력을 duration 길이의 정지 영상 + 페이드로 만드는 필터입니다.
+    (Ken Burns 없는 경로, 반복 프레임을 버리려면 뒤에 _static_frame_select를 붙임)
+    """
+    total_frames = int(fps * duration)
+    return (
+        f"scale={width}:{height},"
+        f"loop=loop={total_frames - 1}:size=1:start=0,"
+        f"settb=1/{fps},setpts=N/({fps}*TB),"
+        f"{_fade_filter(fps, duration, transition_duration, fades)}"
+    )
+
+
+def _static_frame_select(
+    fps: int, durations: list, transition_duration: float, transition: str = "black",
+) -> str:
+    """
+    이어 붙은 정지 슬라이드들에서 페이드 구간 프레임, 정지 구간의 첫 프레임,
+    슬라이드 마지막 프레임만 남기는 select 필터입니다.
+
+    나머지(같은 그림의 반복)를 버리면 가변 프레임 레이트가 되어 정지 구간은 한 프레임이
+    길게 유지되고, 인코더는 페이드 구간만 fps대로 인코딩합니다. 프레임 번호(n) 기준이므로
+    concat 필터 뒤 전체 타임라인에 한 번 적용합니다 (concat 필터는 가변 프레임 레이트 구간의
+    길이를 프레임 수로 추정해서 어긋남).
+    xfade 전환이면 슬라이드가 전환 길이만큼 겹친 타임라인(_xfade_filters)의
+    전환 구간과 처음/끝 페이드 구간을 남깁니다.
+    """
+    fade_frames = int(fps * transition_duration)
+    terms = []
+    offset = 0
+    for duration in durations:
+        total_frames = int(fps * duration)
+        fade_out_start = min(int(fps * (duration - transition_duration)), total_frames - 1)
+        # 페이드 인 (xfade면 앞 슬라이드와의 전환) 구간 + 이어지는 정지 구간의 첫 프레임
+        terms.append(f"between(n,{offset},{offset + fade_frames})")
+        if transition == "black":
+            terms.append(f"between(n,{offset + fade_out_start},{offset + total_frames - 1})")
+            offset += total_frames
+        else:
+            offset += total_frames - fade_frames
+    if transition != "black":
+        # 마지막 슬라이드의 페이드 아웃 + 마지막 프레임
+        timeline_frames = offset + fade_frames
+        terms.append(
+            f"between(n,{timeline_frames - total_frames + fade_out_start},{timeline_frames - 1})"
+        )
+    return f"select='{'+'.join(terms)}'"
+
+
+# 슬라이드 전환
+#   black: 클립마다 검은 화면으로 페이드 인/아웃 (슬라이드 사이가 검게 비었다가 넘어감)
+#   그 외: xfade 전환 이름 - 이웃한 슬라이드를 합치기 그래프에서 겹쳐 전환 (오디오는 acrossfade)
+TRANSITIONS = (
+    "black",
+    "fade", "dissolve", "fadeblack", "fadewhite", "fadegrays",
+    "wipeleft", "wiperight", "wipeup", "wipedown",
+    "slideleft", "slideright", "slideup", "slidedown",
+    "smoothleft", "smoothright", "smoothup", "smoothdown",
+    "circleopen", "circleclose", "radial", "pixelize",
+)
+
+
+def _resolve_transition(caps: dict, transition: str, fps: int, transition_duration: float) -> str:
+    """
+    ffmpeg 기능에 맞는 전환 방식을 고릅니다 (xfade를 쓸 수 없으면 black).
+
+    acrossfade의 nofade 곡선(다음 나레이션을 줄이지 않음)은 ffmpeg 5.0부터 있습니다.
+    """
+    if transition == "black":
+        return transition
+    if int(fps * transition_duration) < 1:
+        print("  ⚠️  전환 시간이 한 프레임보다 짧아 xfade 전환 없이 생성합니다.")
+        return "black"
+    if not has_filters(caps, "xfade", "acrossfade") or not version_at_least(caps, 5, 0):
+        print(f"  ⚠️  ffmpeg {caps['version']}에서 {transition} 전환을 쓸 수 없어 "
+              f"검은 화면 페이드로 대신합니다.")
+        return "black"
+    return transition
+
+
+def _slide_fades(index: int, count: int, transition: str) -> tuple:
+    """
+    슬라이드의 (페이드 인, 페이드 아웃) 여부.
+
+    xfade 전환이면 슬라이드 사이는 겹쳐서 전환하므로 영상 처음과 끝만 페이드합니다.
+    """
+    if transition == "black":
+        return True, True
+    return index == 0, index == count - 1
+
+
+def _timeline_length(plan: list, fps: int, transition: str, transition_duration: float) -> float:
+    """최종 영상 길이 (xfade 전환이면 전환마다 겹치는 길이를 뺌)."""
+    total = sum(_clip_length(duration, fps) for duration, _ in plan)
+    if transition != "black":
+        total -= (len(plan) - 1) * int(fps * transition_duration) / fps
+    return total
+
+
+def _xfade_input_filter(fps: int, duration: float) -> str:
+    """
+    xfade 입력용으로 슬라이드 스트림을 고정 프레임 레이트 + 정확한 프레임 수로 맞춥니다.
+
+    xfade는 고정 프레임 레이트 입력만 받고, 전환 시점(offset)은 슬라이드마다
+    int(fps * duration) 프레임을 가정하므로 클립/단일 패스 모두 이 필터를 거칩니다.
+    fps 필터는 길이를 모르는 마지막 프레임을 버리므로 한 프레임을 복제해 채운 뒤 자릅니다.
+    """
+    return (
+        f"setpts=PTS-STARTPTS,fps={fps},"
+        f"tpad=stop_mode=clone:stop=1,trim=end_frame={int(fps * duration)}"
+    )
+
+
+def _xfade_filters(
+    video_labels: list, audio_labels: list | None, plan: list, fps: int,
+    transition: str, transition_duration: float,
+) -> tuple:
+    """
+    이웃한 슬라이드를 xfade(비디오) / acrossfade(오디오)로 겹쳐 잇는 필터를 만듭니다.
+
+    k번째 전환은 앞 슬라이드들의 (프레임 단위로 맞춘) 표시 시간 합에서 이미 겹친
+    전환 길이를 뺀 시점에 시작하므로, 표시 시간(TTS 길이 + 여유)이 달라도 어긋나지 않습니다.
+    오디오는 앞 슬라이드의 끝(TTS 뒤 여유 무음)만 페이드 아웃하고 다음 TTS는 그대로 두어
+    나레이션이 다음 슬라이드가 나타나기 시작할 때부터 작아지지 않고 들립니다.
+
+    Returns:
+        (필터 리스트, 비디오 라벨, 오디오 라벨 또는 None)
+    """
+    fade_frames = int(fps * transition_duration)
+    fade_seconds = f"{fade_frames / fps:.6f}"
+    filters = []
+    video_label = video_labels[0]
+    audio_label = audio_labels[0] if audio_labels else None
+    timeline_frames = int(fps * plan[0][0])
+    for k in range(1, len(plan)):
+        offset = (timeline_frames - fade_frames) / fps
+        filters.append(
+            f"{video_label}{video_labels[k]}xfade=transition={transition}"
+            f":duration={fade_seconds}:offset={offset:.6f}[vx{k}]"
+        )
+        video_label = f"[vx{k}]"
+        if audio_labels:
+            filters.append(
+                f"{audio_label}{audio_labels[k]}acrossfade=d={fade_seconds}:c1=tri:c2=nofade[ax{k}]"
+            )
+            audio_label = f"[ax{k}]"
+        timeline_frames += int(fps * plan[k][0]) - fade_frames
+    return filters, video_label, audio_label
+
+
+def _build_single_pass_graph(
+    slides: list,
+    plan: list,
+    fps: int,
+    transition_duration: float,
+    width: int,
+    height: int,
+    ken_burns: bool,
+    bgm_path: str | None,
+    bgm_volume: float,
+    motion_engine: str = "zoompan",
+    transition: str = "black",
+) -> tuple:
+    """
+    모든 슬라이드/오디오를 하나의 filter_complex 그래프로 구성합니다.
+
+    슬라이드별 zoompan(또는 정지 영상)+페이드, TTS 패딩/트리밍, concat,
+    BGM 믹싱까지 한 번의 ffmpeg 실행에서 처리합니다.
+    그래프 안에서 프레임을 만들 수 없는 "pillow" 모션 엔진은 "crop"으로 대신합니다.
+    transition이 xfade 전환이면 concat 대신 xfade/acrossfade로 슬라이드를 겹쳐 잇습니다.
+
+    Returns:
+        (입력 옵션 리스트, filter_complex 문자열, 비디오 라벨, 오디오 라벨 또는 None, stdin 바이트)
+    """
+    input_args = []
+    filters = []
+    stdin_data = None
+    count = len(slides)
+
+    # 1. 슬라이드 입력 (파일은 각각, 메모리 슬라이드는 stdin 하나로 묶어서 select로 분리)
+    if isinstance(slides[0], Image.Image):
+        input_args += _image_input_args(slides[0])
+        stdin_data = b"".join(_slide_stdin(slide) for slide in slides)
+        split_labels = "".join(f"[src{i}]" for i in range(count))
+        filters.append(f"[0:v]split={count}{split_labels}")
+        frame_sources = [f"[src{i}]select='eq(n,{i})',setpts=PTS-STARTPTS," for i in range(count)]
+        next_input = 1
     else:
-        cmd = [
-            "ffmpeg", "-y",
-            "-i", slide_path,
-            "-c:v", "libx264",
-            "-t", str(duration),
+        frame_sources = []
+        for i, slide in enumerate(slides):
+            input_args += _image_input_args(slide)
+            frame_sources.append(f"[{i}:v]")
+        next_input = count
+
+    # 2. 슬라이드별 영상 (Ken Burns 또는 정지 영상 + 페이드)
+    filter_engine = "crop" if motion_engine == "pillow" else motion_engine
+    for i, (duration, _) in enumerate(plan):
+        fades = _slide_fades(i, count, transition)
+        if ken_burns:
+            chain = _build_zoom_filter(
+                width, height, fps, duration, transition_duration, i, filter_engine, fades
+            )
+        else:
+            chain = _static_slide_filter(width, height, fps, duration, transition_duration, fades)
+        if transition != "black":
+            chain += f",{_xfade_input_filter(fps, duration)}"
+        filters.append(f"{frame_sources[i]}{chain},setsar=1[v{i}]")
+
+    # 3. 슬라이드별 TTS (프레임 단위로 맞춘 클립 길이에 맞춰 무음 패딩 후 자르기)
+    has_tts = plan[0][1] is not None
+    # 정지 슬라이드는 concat 뒤에 반복 프레임을 버리므로 concat 출력을 한 번 더 거침
+    concat_video = "[vout]" if ken_burns else "[vcat]"
+    if has_tts:
+        for i, (duration, tts_path) in enumerate(plan):
+            input_args += ["-i", tts_path]
+            filters.append(
+                f"[{next_input}:a]aformat=sample_rates=48000:channel_layouts=stereo,"
+                f"apad,atrim=0:{_clip_length(duration, fps):.6f},asetpts=PTS-STARTPTS[a{i}]"
+            )
+            next_input += 1
+    if transition != "black":
+        xfade_filters, video_label, audio_label = _xfade_filters(
+            [f"[v{i}]" for i in range(count)],
+            [f"[a{i}]" for i in range(count)] if has_tts else None,
+            plan, fps, transition, transition_duration,
+        )
+        filters += xfade_filters
+        filters.append(f"{video_label}null{concat_video}")
+        if has_tts:
+            filters.append(f"{audio_label}anull[tts]")
+    elif has_tts:
+        segments = "".join(f"[v{i}][a{i}]" for i in range(count))
+        filters.append(f"{segments}concat=n={count}:v=1:a=1{concat_video}[tts]")
+    else:
+        segments = "".join(f"[v{i}]" for i in range(count))
+        filters.append(f"{segments}concat=n={count}:v=1:a=0{concat_video}")
+    audio_label = "[tts]" if has_tts else None
+    
+    if not ken_burns:
+        # 반복 프레임을 버려 페이드 구간만 인코딩 (가변 프레임 레이트)
+        select = _static_frame_select(
+            fps, [duration for duration, _ in plan], transition_duration, transition
+        )
+        filters.append(f"{concat_video}{select}[vout]")
+
+    # 4. BGM 믹싱
+    if bgm_path:
+        input_args += ["-i", bgm_path]
+        if has_tts:
+            filters.append(f"[tts]volume=1.0[ttsv];[{next_input}:a]volume={bgm_volume}[bgm]")
+            filters.append("[ttsv][bgm]amix=inputs=2:duration=first[aout]")
+        else:
+            total_duration = _timeline_length(plan, fps, transition, transition_duration)
+            filters.append(
+                f"[{next_input}:a]volume={bgm_volume},apad,atrim=0:{total_duration:.6f}[aout]"
+            )
+        audio_label = "[aout]"
+
+    return input_args, ";".join(filters), "[vout]", audio_label, stdin_data
+
+
+# 출력 형식
+#   mp4:  일반 MP4 (인코딩이 끝난 뒤 +faststart로 moov를 앞으로 옮김)
+#   fmp4: fragmented MP4 (키프레임마다 조각을 바로 기록, 인코딩 중에도 앞부분을 읽을 수 있음)
+#   hls:  HLS 이벤트 플레이리스트 + fMP4 세그먼트 (세그먼트가 끝날 때마다 플레이리스트 갱신)
+OUTPUT_FORMATS = ("mp4", "fmp4", "hls")
+SEGMENT_SECONDS = 2  # fmp4 조각 / HLS 세그먼트 길이 (키프레임 간격)
+
+
+def _output_target(output_path: str, output_format: str) -> str:
+    """출력 형식에 맞는 최종 파일 경로 (hls는 .m3u8 플레이리스트)."""
+    if output_format == "hls":
+        return f"{os.path.splitext(output_path)[0]}.m3u8"
+    return output_path
+
+
+def _container_args(output_format: str, output_path: str) -> list:
+    """출력 경로 바로 앞에 붙는 컨테이너(muxer) 옵션."""
+    if output_format == "fmp4":
+        return ["-movflags", "+frag_keyframe+empty_moov+default_base_moof"]
+    if output_format == "hls":
+        # 세그먼트/초기화 파일은 플레이리스트 옆에 <이름>_00000.m4s, <이름>_init.mp4로 저장
+        stem = os.path.splitext(os.path.basename(output_path))[0]
+        return [
+            "-f", "hls",
+            "-hls_time", str(SEGMENT_SECONDS),
+            "-hls_playlist_type", "event",
+            "-hls_segment_type", "fmp4",
+            "-hls_fmp4_init_filename", f"{stem}_init.mp4",
+            "-hls_segment_filename", os.path.join(os.path.dirname(output_path), f"{stem}_%05d.m4s"),
+        ]
+    return ["-movflags", "+faststart"]
+
+
+def _hls_files(playlist_path: str) -> list:
+    """HLS 플레이리스트가 가리키는 초기화 파일과 세그먼트 경로 목록."""
+    playlist_dir = os.path.dirname(playlist_path)
+    files = []
+    with open(playlist_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("#EXT-X-MAP:"):
+                match = re.search(r'URI="([^"]+)"', line)
+                if match:
+                    files.append(os.path.join(playlist_dir, match.group(1)))
+            elif line and not line.startswith("#"):
+                files.append(os.path.join(playlist_dir, line))
+    return files
+
+
+def _remove_hls_files(playlist_path: str):
+    """
+    이전 렌더링이 남긴 같은 이름의 초기화 파일/세그먼트를 지웁니다.
+
+    <이름>_00000.m4s 형식만 지워 추가 출력(<이름>_720p_00000.m4s)의 세그먼트는 건드리지 않습니다.
+    """
+    stem = glob.escape(os.path.splitext(playlist_path)[0])
+    for path in [*glob.glob(f"{stem}_init.mp4"), *glob.glob(f"{stem}_{'[0-9]' * 5}.m4s")]:
+        os.remove(path)
+
+
+def _output_size(output_path: str, output_format: str) -> int:
+    """출력 크기 (hls는 플레이리스트 + 플레이리스트에 있는 초기화 파일/세그먼트 합계)."""
+    if output_format != "hls":
+        return os.path.getsize(output_path)
+    files = [output_path, *_hls_files(output_path)]
+    return sum(os.path.getsize(path) for path in files if os.path.exists(path))
+
+
+def _keyframe_args(output_format: str) -> list:
+    """조각/세그먼트를 일정한 길이로 자를 수 있도록 키프레임 간격을 고정합니다 (재인코딩 시)."""
+    if output_format == "mp4":
+        return []
+    return ["-force_key_frames", f"expr:gte(t,n_forced*{SEGMENT_SECONDS})"]
+
+
+def _rendition_path(output_path: str, rendition: dict) -> str:
+    """추가 출력 파일 경로 (shorts_20250214_quote.mp4 → shorts_20250214_quote_720p.mp4)."""
+    stem, ext = os.path.splitext(output_path)
+    return f"{stem}_{rendition['name']}{ext or '.mp4'}"
+
+
+def _rendition_filters(video_label: str, audio_label: str | None, renditions: list) -> tuple:
+    """
+    최종 영상 스트림을 split으로 나눠 추가 출력별 해상도로 축소하는 필터를 만듭니다.
+
+    video_label/audio_label은 filter 라벨("[vout]") 또는 입력 스트림("0:v")입니다.
+    filter 라벨은 한 번만 쓸 수 있으므로 주 출력 몫까지 split/asplit으로 나누고,
+    입력 스트림은 주 출력이 그대로 쓰고 추가 출력 몫만 나눕니다.
+
+    Returns:
+        (필터 리스트, 주 출력 비디오 라벨, 주 출력 오디오 라벨,
+         추가 출력별 (비디오 라벨, 오디오 라벨) 리스트)
+    """
+    filters = []
+    count = len(renditions)
+
+    is_input = not video_label.startswith("[")
+    split_count = count if is_input else count + 1
+    labels = [f"[rsplit{i}]" for i in range(split_count)]
+    source = f"[{video_label}]" if is_input else video_label
+    filters.append(f"{source}split={split_count}{''.join(labels)}")
+    if not is_input:
+        video_label = labels.pop(0)
+    video_labels = []
+    for i, (label, rendition) in enumerate(zip(labels, renditions)):
+        filters.append(f"{label}scale={rendition['width']}:{rendition['height']},setsar=1[rv{i}]")
+        video_labels.append(f"[rv{i}]")
+
+    if audio_label is None:
+        audio_labels = [None] * count
+    elif audio_label.startswith("["):
+        labels = [f"[rasplit{i}]" for i in range(count + 1)]
+        filters.append(f"{audio_label}asplit={count + 1}{''.join(labels)}")
+        audio_label, audio_labels = labels[0], labels[1:]
+    else:
+        audio_labels = [audio_label] * count  # 입력 스트림은 여러 출력에 다시 매핑 가능
+
+    return filters, video_label, audio_label, list(zip(video_labels, audio_labels))
+
+
+# 비트레이트 설정값: 숫자/접미사 없는 문자열은 bps, k/M 접미사는 ffmpeg처럼 10진 단위
+BITRATE_PATTERN = re.compile(r"(\d+(?:\.\d*)?|\.\d+)\s*([kKmM]?)")
+BITRATE_UNITS = {"": 1, "k": 1000, "m": 1000 * 1000}
+
+
+def _parse_bitrate(value) -> int:
+    """
+    비트레이트 설정값을 bps 정수로 바꿉니다.
+
+    2500000, "2500000" → 2500000 / "2500k" → 2500000 / "2.5M" → 2500000
+    """
+    match = BITRATE_PATTERN.fullmatch(str(value).strip())
+    if not match:
+        raise ValueError(f"잘못된 비트레이트: {value!r} (예: 2500000, \"2500k\", \"2.5M\")")
+    bps = round(float(match.group(1)) * BITRATE_UNITS[match.group(2).lower()])
+    if bps <= 0:
+        raise ValueError(f"비트레이트는 0보다 커야 합니다: {value!r}")
+    return bps
+
+
+def _check_rendition(rendition: dict):
+    """
+    추가 출력 설정을 인코딩 전에 확인합니다 (잘못되면 rendition 이름을 담은 ValueError).
+
+    합치기 단계에서야 실패해 클립 인코딩을 모두 버리지 않도록 create_video 시작 시 호출합니다.
+    """
+    if not all(key in rendition for key in ("name", "width", "height")):
+        raise ValueError(f"rendition에는 name, width, height가 필요합니다: {rendition}")
+    name = rendition["name"]
+    for key in ("video_bitrate", "audio_bitrate"):
+        if rendition.get(key) is not None:
+            try:
+                _parse_bitrate(rendition[key])
+            except ValueError as e:
+                raise ValueError(f"rendition {name}의 {key}: {e}") from None
+    crf = rendition.get("crf")
+    if crf is not None:
+        try:
+            crf_value = float(crf)
+        except (TypeError, ValueError):
+            crf_value = -1
+        if crf_value < 0:
+            raise ValueError(f"rendition {name}의 crf는 0 이상의 숫자여야 합니다: {crf!r}")
+
+
+def _rendition_output_args(
+    rendition: dict, video_label: str, audio_label: str | None, fps: int,
+    x264_preset: str | None, output_path: str, extra_args: list | None = None,
+    output_format: str = "mp4",
+) -> list:
+    """
+    추가 출력 하나의 ffmpeg 출력 옵션을 만듭니다.
+
+    rendition 키: name, width, height (필수), codec (기본 libx264), preset,
+    crf 또는 video_bitrate, audio_bitrate (기본 "128k")
+    비트레이트는 bps 숫자 또는 "2500k", "2.5M" 형식입니다 (_parse_bitrate 참조).
+    """
+    codec = rendition.get("codec", "libx264")
+    preset = rendition.get("preset", x264_preset)
+    args = ["-map", video_label]
+    if audio_label:
+        audio_bps = _parse_bitrate(rendition.get("audio_bitrate", "128k"))
+        args += ["-map", audio_label, "-c:a", "aac", "-b:a", str(audio_bps)]
+    if codec == "libx264":
+        args += _x264_args(preset)
+    else:
+        args += ["-c:v", codec] + (["-preset", preset] if preset else [])
+    bitrate = rendition.get("video_bitrate")
+    if bitrate is not None:
+        # 업로드/스트리밍용: 최대 비트레이트를 함께 제한
+        bps = _parse_bitrate(bitrate)
+        args += ["-b:v", str(bps), "-maxrate", str(bps), "-bufsize", str(bps * 2)]
+    elif rendition.get("crf") is not None:
+        args += ["-crf", str(rendition["crf"])]
+    return [
+        *args,
+        *_keyframe_args(output_format),
+        "-pix_fmt", "yuv420p",
+        "-r", str(fps),
+        *(extra_args or []),
+        *_container_args(output_format, output_path),
+        output_path,
+    ]
+
+
+def _render_single_pass(
+    slides: list,
+    plan: list,
+    output_path: str,
+    fps: int,
+    transition_duration: float,
+    width: int,
+    height: int,
+    ken_burns: bool,
+    x264_preset: str | None,
+    bgm_path: str | None,
+    bgm_volume: float,
+    motion_engine: str = "zoompan",
+    log_dir: str | None = None,
+    on_progress=None,
+    renditions: list | None = None,
+    output_format: str = "mp4",
+    transition: str = "black",
+) -> subprocess.CompletedProcess:
+    """
+    filter_complex 그래프 하나로 최종 MP4를 한 번에 인코딩합니다.
+
+    renditions((rendition dict, 출력 경로) 리스트)가 있으면 같은 그래프의 결과를
+    split으로 나눠 추가 출력도 함께 인코딩합니다 (슬라이드 디코딩/줌/페이드는 한 번만).
+    """
+
+    def run(use_ken_burns: bool, job: str) -> subprocess.CompletedProcess:
+        input_args, graph, video_label, audio_label, stdin_data = _build_single_pass_graph(
+            slides, plan, fps, transition_duration, width, height,
+            use_ken_burns, bgm_path, bgm_volume, motion_engine, transition,
+        )
+        rendition_labels = []
+        if renditions:
+            rendition_filters, video_label, audio_label, rendition_labels = _rendition_filters(
+                video_label, audio_label, [rendition for rendition, _ in renditions]
+            )
+            graph = ";".join([graph, *rendition_filters])
+        cmd = ["ffmpeg", "-y", *input_args, "-filter_complex", graph, "-map", video_label]
+        if audio_label:
+            cmd += ["-map", audio_label, "-c:a", "aac", "-b:a", "192k"]
+        if use_ken_burns:
+            video_args = [*_x264_args(x264_preset), "-r", str(fps)]
+        else:
+            # 정지 슬라이드: 가변 프레임 레이트 그대로 (-r로 반복 프레임을 다시 만들지 않음)
+            longest = max(int(fps * duration) for duration, _ in plan)
+            video_args = [*_x264_args(x264_preset, keyint=longest), *_vfr_args()]
+        cmd += [
+            *video_args,
+            *_keyframe_args(output_format),
             "-pix_fmt", "yuv420p",
-            "-vf", vf,
+            *_container_args(output_format, output_path),
             output_path,
         ]
+        for (rendition, path), (rendition_video, rendition_audio) in zip(renditions or [], rendition_labels):
+            cmd += _rendition_output_args(
+                rendition, rendition_video, rendition_audio, fps, x264_preset, path,
+                output_format=output_format,
+            )
+        return _run_ffmpeg(cmd, job, log_dir, stdin_data, on_progress)
+
+    print("  🔧 단일 패스 렌더링 중 (filter_complex)...")
+    result = run(ken_burns, "single_pass")
+    if result.returncode != 0 and ken_burns:
+        # fallback: 줌 효과 없이 정지 영상 + 페이드
+        print("  ⚠️  Ken Burns 필터 실패, 줌 효과 없이 다시 렌더링합니다.")
+        result = run(False, "single_pass_fallback")
+    return result
+
+
+# 인코딩된 클립 캐시 (cache_dir/clips/<키>.mp4, 무손실 중간 코덱은 <키>.nut)
+CLIP_CACHE_VERSION = 2  # 클립 필터/세그먼트 파라미터가 바뀌면 올려서 캐시 무효화
+CLIP_CACHE_MB = 1024
+FILE_DIGESTS = {}       # (경로, mtime, 크기) -> sha256
+
+
+def _file_digest(path: str) -> str:
+    """파일 내용의 해시를 반환합니다 (경로/수정시각/크기별로 캐시)."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if key not in FILE_DIGESTS:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        FILE_DIGESTS[key] = digest.hexdigest()
+    return FILE_DIGESTS[key]
+
+
+def _slide_digest(slide) -> str:
+    """슬라이드(파일 경로 또는 PIL Image) 내용의 해시."""
+    if isinstance(slide, Image.Image):
+        digest = hashlib.sha256(f"{slide.mode}:{slide.width}x{slide.height}:".encode())
+        digest.update(slide.tobytes())
+        return digest.hexdigest()
+    return _file_digest(slide)
+
+
+def _clip_cache_key(
+    slide, tts_path: str | None, duration: float, fps: int, transition_duration: float,
+    slide_index: int, width: int, height: int, ken_burns: bool, motion_engine: str,
+    x264_preset: str | None, ffmpeg_version: str, intermediate_codec: str = "h264",
+    fades: tuple = (True, True),
+) -> str:
+    """클립 인코딩 결과를 결정하는 모든 입력의 해시를 만듭니다."""
+    payload = {
+        "version": CLIP_CACHE_VERSION,
+        "slide": _slide_digest(slide),
+        "tts": _file_digest(tts_path) if tts_path else None,
+        "length": f"{_clip_length(duration, fps):.6f}",
+        "fps": fps,
+        "transition": transition_duration,
+        "fades": list(fades),
+        "size": [width, height],
+        # 줌 방향은 슬라이드 번호의 홀짝으로 정해짐
+        "motion": [motion_engine, slide_index % 2] if ken_burns else None,
+        "preset": x264_preset,
+        "codec": intermediate_codec,
+        "ffmpeg": ffmpeg_version,
+    }
+    encoded = json.dumps(payload, sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _link_or_copy(src: str, dst: str):
+    """같은 파일 시스템이면 하드 링크, 아니면 복사합니다."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def _store_clip(clip_path: str, cache_path: str):
+    """인코딩한 클립을 캐시에 넣습니다 (다른 작업이 반쯤 쓴 파일을 읽지 않도록 교체 방식)."""
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        _link_or_copy(clip_path, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _evict_clip_cache(clips_dir: str, max_bytes: int):
+    """클립 캐시가 max_bytes를 넘으면 가장 오래 사용하지 않은 파일부터 지웁니다."""
+    entries = []
+    total = 0
+    for entry in os.scandir(clips_dir):
+        if not entry.name.endswith(CLIP_EXTENSIONS):
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total += stat.st_size
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
-
-    if result.returncode != 0:
-        # fallback: zoompan 없이 기본 fade만 적용
-        fade_frames = int(fps * transition_duration)
-        fade_out_start = int(fps * (duration - transition_duration))
-        simple_vf = f"scale=1080:1920,fade=in:0:{fade_frames},fade=out:{fade_out_start}:{fade_frames}"
-
-        if tts_path:
-            cmd_simple = [
-                "ffmpeg", "-y",
-                "-loop", "1",
-                "-i", slide_path,
-                "-i", tts_path,
-                "-c:v", "libx264",
-                "-c:a", "aac",
-                "-b:a", "192k",
-                "-t", str(duration),
-                "-pix_fmt", "yuv420p",
-                "-r", str(fps),
-                "-vf", simple_vf,
-                "-shortest",
-                output_path,
-            ]
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def _render_with_clips(
+    slide_paths: list,
+    plan: list,
+    temp_dir: str,
+    output_path: str,
+    fps: int,
+    transition_duration: float,
+    width: int,
+    height: int,
+    ken_burns: bool,
+    x264_preset: str | None,
+    bgm_path: str | None,
+    bgm_volume: float,
+    cpu_budget: int = 0,
+    motion_engine: str = "zoompan",
+    can_probe: bool = True,
+    log_dir: str | None = None,
+    on_progress=None,
+    clip_cache_dir: str | None = None,
+    clip_cache_mb: int = CLIP_CACHE_MB,
+    ffmpeg_version: str = "",
+    renditions: list | None = None,
+    output_format: str = "mp4",
+    intermediate_codec: str = "h264",
+    transition: str = "black",
+) -> subprocess.CompletedProcess:
+    """
+    슬라이드별 클립을 병렬로 만든 뒤 concat으로 합칩니다.
+
+    can_probe가 False(ffprobe 없음)면 클립 비교 없이 바로 재인코딩으로 합칩니다.
+    clip_cache_dir이 주어지면 (슬라이드 해시, TTS 해시, 길이, fps, 전환, 모션, 인코더 설정)이
+    같은 클립은 다시 인코딩하지 않고 캐시에서 가져옵니다. 캐시는 clip_cache_mb를 넘으면
+    LRU로 정리됩니다.
+    renditions는 (rendition dict, 출력 경로) 리스트로, 합치기 호출에서 함께 인코딩합니다.
+    output_format은 합친 영상의 컨테이너입니다 (_container_args 참조).
+    intermediate_codec이 무손실 코덱이면 클립을 무손실로 빠르게 만들고, 합치기 단계에서
+    최종 영상을 한 번만 손실 인코딩합니다 (INTERMEDIATE_CODECS 참조).
+    transition이 xfade 전환이면 클립 사이 페이드 없이 만들고, 합치기 호출의 그래프에서
+    xfade/acrossfade로 겹쳐 이으며 인코딩합니다 (스트림 복사 없음, _xfade_filters 참조).
+    """
+    has_tts = plan[0][1] is not None
+    clip_ext = INTERMEDIATE_CODECS[intermediate_codec][1]
+    temp_videos = [
+        os.path.join(temp_dir, f"clip_{i:03d}{clip_ext}") for i in range(len(slide_paths))
+    ]
+    
+    # 0단계: 캐시에 있는 클립은 가져오고 나머지만 인코딩
+    cache_paths = {}
+    pending = []
+    clip_fades = [_slide_fades(i, len(slide_paths), transition) for i in range(len(slide_paths))]
+    for i, (slide_path, (clip_duration, tts_path)) in enumerate(zip(slide_paths, plan)):
+        if clip_cache_dir:
+            key = _clip_cache_key(
+                slide_path, tts_path, clip_duration, fps, transition_duration, i,
+                width, height, ken_burns, motion_engine, x264_preset, ffmpeg_version,
+                intermediate_codec, clip_fades[i],
+            )
+            cache_path = os.path.join(clip_cache_dir, f"{key}{clip_ext}")
+            if os.path.exists(cache_path):
+                try:
+                    _link_or_copy(cache_path, temp_videos[i])
+                    os.utime(cache_path)  # LRU: 최근 사용 시각 갱신
+                    print(f"  ♻️  슬라이드 {i+1}/{len(slide_paths)} 캐시된 클립 사용")
+                    continue
+                except OSError:
+                    pass  # 캐시가 도중에 지워졌으면 다시 인코딩
+            cache_paths[i] = cache_path
+        pending.append(i)
+    
+    # 1단계: 각 슬라이드를 개별 비디오 클립으로 변환 (코어 예산 내에서 동시 실행)
+    concurrency, threads_per_job = _thread_budget(max(len(pending), 1), cpu_budget)
+    if concurrency > 1:
+        print(f"  ⚡ 클립 {concurrency}개 동시 인코딩 (프로세스당 {threads_per_job}스레드)")
+    
+    motion_failed = threading.Event()
+    motion_fallbacks = set()  # Ken Burns 대신 정지 슬라이드로 만든 클립 번호
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {}
+        for i in pending:
+            slide_path = slide_paths[i]
+            clip_duration, tts_path = plan[i]
+            future = executor.submit(
+                _create_slide_clip,
+                slide_path=slide_path,
+                output_path=temp_videos[i],
+                duration=clip_duration,
+                fps=fps,
+                transition_duration=transition_duration,
+                tts_path=tts_path,
+                slide_index=i,
+                width=width,
+                height=height,
+                ken_burns=ken_burns,
+                x264_preset=x264_preset,
+                threads=threads_per_job,
+                motion_engine=motion_engine,
+                motion_failed=motion_failed,
+                motion_fallbacks=motion_fallbacks,
+                log_dir=log_dir,
+                on_progress=on_progress,
+                intermediate_codec=intermediate_codec,
+                fades=clip_fades[i],
+            )
+            futures[future] = (i, clip_duration)
+        
+        for future in as_completed(futures):
+            i, clip_duration = futures[future]
+            if not future.result():
+                print(f"  ⚠️  슬라이드 {i+1} 변환 중 오류 발생")
+            elif i in cache_paths and i not in motion_fallbacks:
+                # Ken Burns fallback으로 만든 클립은 같은 키로 저장하지 않음
+                _store_clip(temp_videos[i], cache_paths[i])
+            duration_str = f" ({clip_duration:.1f}초)" if has_tts else ""
+            print(f"  📹 슬라이드 {i+1}/{len(slide_paths)} 변환 완료{duration_str}")
+    
+    if cache_paths:
+        _evict_clip_cache(clip_cache_dir, clip_cache_mb * 1024 * 1024)
+    
+    # 2단계: concat 파일 생성
+    concat_file = os.path.join(temp_dir, "concat_list.txt")
+    with open(concat_file, "w") as f:
+        for video, (clip_duration, _) in zip(temp_videos, plan):
+            f.write(f"file '{os.path.abspath(video)}'\n")
+            # 가변 프레임 레이트 클립은 컨테이너 길이가 마지막 프레임 길이만큼 짧게 읽히므로
+            # 다음 클립의 시작 위치를 정확한 클립 길이로 지정
+            f.write(f"duration {_clip_length(clip_duration, fps):.6f}\n")
+    
+    # 3단계: 영상 합치기
+    total_length = _timeline_length(plan, fps, transition, transition_duration)
+    # 클립 파라미터가 모두 같으면 재인코딩 없이 스트림 복사(먹싱만)
+    # Ken Burns 클립과 fallback 정지 클립(인코더 설정이 다름)이 섞였으면 복사하지 않음
+    # 무손실 클립은 여기서 처음(이자 한 번만) 손실 인코딩
+    mixed_clips = bool(motion_fallbacks)
+    lossless_clips = intermediate_codec != "h264"
+    use_xfade = transition != "black"
+    stream_copy = (
+        can_probe and not mixed_clips and not lossless_clips and not use_xfade
+        and _segments_match(temp_videos)
+    )
+    if stream_copy:
+        print("  ⚡ 클립 파라미터 일치: 스트림 복사로 합칩니다")
+        video_codec_args = ["-c:v", "copy"]
+    else:
+        if use_xfade:
+            print(f"  🔀 {transition} 전환으로 클립을 겹쳐 이으며 인코딩합니다")
+        elif lossless_clips:
+            print(f"  🔧 무손실 클립({intermediate_codec})을 최종 영상으로 한 번에 인코딩합니다")
+        elif can_probe:
+            print("  ⚠️  클립 파라미터 불일치: 재인코딩으로 합칩니다")
+        else:
+            print("  ⚠️  ffprobe가 없어 클립을 비교할 수 없습니다: 재인코딩으로 합칩니다")
+        video_codec_args = [*_x264_args(x264_preset), *_keyframe_args(output_format), "-pix_fmt", "yuv420p"]
+        if not ken_burns:
+            video_codec_args += _vfr_args()  # 정지 클립은 가변 프레임 레이트 그대로 다시 인코딩
+    
+    filters = []
+    if use_xfade:
+        # 클립마다 입력으로 열어 xfade 그래프로 이음
+        # xfade 입력은 고정 프레임 레이트여야 하므로 정지 클립(가변 프레임 레이트)도 fps로 되돌림
+        input_args = []
+        for i, (video, (clip_duration, _)) in enumerate(zip(temp_videos, plan)):
+            input_args += ["-i", video]
+            filters.append(f"[{i}:v]{_xfade_input_filter(fps, clip_duration)}[c{i}]")
+            if has_tts:
+                filters.append(
+                    f"[{i}:a]atrim=0:{_clip_length(clip_duration, fps):.6f},"
+                    f"asetpts=PTS-STARTPTS[ca{i}]"
+                )
+        xfade_filters, video_label, tts_label = _xfade_filters(
+            [f"[c{i}]" for i in range(len(temp_videos))],
+            [f"[ca{i}]" for i in range(len(temp_videos))] if has_tts else None,
+            plan, fps, transition, transition_duration,
+        )
+        filters += xfade_filters
+        if not ken_burns:
+            # 겹친 타임라인에서 다시 반복 프레임을 버림 (가변 프레임 레이트)
+            select = _static_frame_select(
+                fps, [clip_duration for clip_duration, _ in plan], transition_duration, transition
+            )
+            filters.append(f"{video_label}{select}[vsel]")
+            video_label = "[vsel]"
+        bgm_input = len(temp_videos)
+    else:
+        input_args = ["-f", "concat", "-safe", "0", "-i", concat_file]
+        video_label, tts_label = "0:v", "[0:a]"
+        bgm_input = 1
+    
+    duration_args = []
+    if bgm_path:
+        input_args += ["-i", bgm_path]
+        if has_tts:
+            # TTS + BGM 믹싱을 합치기와 같은 호출에서 처리 (비디오는 한 번만 인코딩/복사)
+            # TTS 볼륨 유지, BGM 볼륨 낮춤, BGM이 짧으면 무음으로 채우고 영상 길이에서 자름
+            filters.append(
+                f"{tts_label}volume=1.0[tts];[{bgm_input}:a]volume={bgm_volume},apad[bgm];"
+                f"[tts][bgm]amix=inputs=2:duration=first[a]"
+            )
+            audio_codec_args = ["-c:a", "aac", "-b:a", "192k"]
         else:
-            cmd_simple = [
-                "ffmpeg", "-y",
-                "-loop", "1",
-                "-i", slide_path,
-                "-c:v", "libx264",
-                "-t", str(duration),
-                "-pix_fmt", "yuv420p",
-                "-r", str(fps),
-                "-vf", simple_vf,
-                output_path,
-            ]
-        result = subprocess.run(cmd_simple, capture_output=True, text=True)
-        return result.returncode == 0
+            filters.append(f"[{bgm_input}:a]volume={bgm_volume}[bgm];[bgm]apad[a]")
+            audio_codec_args = ["-c:a", "aac", "-b:a", "128k"]
+        audio_label = "[a]"
+        # 스트림 복사 + apad 조합에서는 -shortest가 끝나지 않으므로 길이를 직접 지정
+        duration_args = ["-t", f"{total_length:.6f}"]
+    elif has_tts:
+        # TTS 오디오가 포함된 클립들을 그대로 합치기 (concat 입력은 스트림 복사 가능)
+        audio_label = tts_label if use_xfade else "0:a"
+        audio_codec_args = ["-c:a", "copy"] if stream_copy else ["-c:a", "aac", "-b:a", "192k"]
+    else:
+        audio_label = None
+        audio_codec_args = []
+    
+    # 추가 출력(rendition)은 같은 호출에서 합친 영상을 한 번만 디코딩해 split으로 나눠 인코딩
+    rendition_labels = []
+    if renditions:
+        rendition_filters, video_label, audio_label, rendition_labels = _rendition_filters(
+            video_label, audio_label, [rendition for rendition, _ in renditions]
+        )
+        filters += rendition_filters
+    
+    cmd = ["ffmpeg", "-y", *input_args]
+    if filters:
+        cmd += ["-filter_complex", ";".join(filters)]
+    cmd += ["-map", video_label]
+    if audio_label:
+        cmd += ["-map", audio_label]
+    cmd += [
+        *video_codec_args,
+        *audio_codec_args,
+        *duration_args,
+        *_container_args(output_format, output_path),
+        output_path,
+    ]
+    for (rendition, path), (rendition_video, rendition_audio) in zip(renditions or [], rendition_labels):
+        cmd += _rendition_output_args(
+            rendition, rendition_video, rendition_audio, fps, x264_preset, path, duration_args,
+            output_format,
+        )
+    
+    if has_tts and bgm_path:
+        print("  🎵 TTS + BGM 믹싱 및 최종 영상 렌더링 중...")
+    else:
+        print("  🔧 최종 영상 렌더링 중...")
+    result = _run_ffmpeg(cmd, "concat", log_dir, on_progress=on_progress)
+    return result
 
-    return True
+
+def _move_into_place(src: str, dst: str):
+    """
+    완성된 파일을 dst로 옮깁니다.
+
+    작업 공간이 다른 파일 시스템(예: /dev/shm)에 있으면 os.replace가 실패하므로
+    dst 옆에 복사한 뒤 교체합니다 (dst에는 항상 완성된 파일만 보이도록).
+    """
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        partial_path = f"{dst}.{os.getpid()}.partial"
+        try:
+            shutil.copyfile(src, partial_path)
+            os.replace(partial_path, dst)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
 
 
 def create_video(
@@ -160,12 +1632,29 @@ def create_video(
     bgm_enabled: bool = False,
     bgm_volume: float = 0.15,
     tts_data: list | None = None,
+    width: int = 1080,
+    height: int = 1920,
+    ken_burns: bool = True,
+    x264_preset: str | None = None,
+    render_mode: str = "clips",
+    cpu_budget: int = 0,
+    motion_engine: str = "zoompan",
+    cache_dir: str = None,
+    log_dir: str = None,
+    on_progress=None,
+    workspace: str = None,
+    clip_cache_mb: int = CLIP_CACHE_MB,
+    renditions: list = None,
+    output_format: str = "mp4",
+    intermediate_codec: str = "h264",
+    transition: str = "black",
 ) -> str:
     """
     슬라이드 이미지들을 영상으로 합성합니다.
     
     Args:
         slide_paths: 슬라이드 이미지 파일 경로 리스트
+                     (render_slides()의 PIL Image 리스트도 가능 - 임시 이미지 파일 없이 처리)
         output_path: 출력 영상 파일 경로
         fps: 프레임 레이트
         slide_duration: 각 슬라이드 기본 표시 시간 (초, TTS 없을 때 사용)
@@ -174,11 +1663,49 @@ def create_video(
         bgm_volume: 배경음악 볼륨
         tts_data: TTS 데이터 리스트 [{"path": str, "duration": float}, ...]
                   None이면 TTS 없이 기존 방식으로 생성
+        width: 영상 너비 (슬라이드 해상도와 같아야 함)
+        height: 영상 높이
+        ken_burns: Ken Burns 줌 효과 사용 여부 (False면 페이드만, 미리보기용)
+        x264_preset: libx264 preset (예: "ultrafast", None이면 기본값)
+        render_mode: "clips" (슬라이드별 클립 인코딩 후 concat) 또는
+                     "single" (filter_complex 하나로 최종 영상을 한 번에 인코딩)
+        cpu_budget: 클립 병렬 인코딩에 사용할 전체 코어 수 (0이면 CPU 코어 수)
+        motion_engine: Ken Burns 구현 방식 - "zoompan", "crop" (crop+scale 필터, 더 빠름),
+                       "pillow" (Pillow로 프레임 생성, single 모드에서는 crop 사용)
+        cache_dir: ffmpeg 기능 확인 결과와 인코딩된 클립을 저장할 캐시 디렉토리
+                   (None이면 메모리 캐시만 사용, 클립 캐시 없음)
+        log_dir: ffmpeg 작업별 로그(<작업>.log)와 metrics.jsonl을 저장할 디렉토리
+                 (None이면 <출력 디렉토리>/logs/<출력 파일명>)
+        on_progress: on_progress(job, stats) 진행 상황 콜백 (_run_ffmpeg 참조)
+        workspace: 이 작업 전용 작업 공간 디렉토리. 주어지면 임시 파일을 그 안에 만들고
+                   입력(슬라이드/TTS) 파일은 지우지 않습니다 (작업 공간 정리는 호출자 몫).
+                   /dev/shm 같은 다른 파일 시스템에 있어도 됩니다.
+                   None이면 출력 디렉토리에 임시 디렉토리를 만들고, 끝나면 입력 임시
+                   디렉토리(슬라이드/TTS 파일이 든 디렉토리)까지 정리합니다.
+        clip_cache_mb: 클립 디스크 캐시 최대 크기 (MB, clips 모드에서 cache_dir이 있을 때)
+        renditions: 함께 만들 추가 출력 리스트. 각 항목은 {"name", "width", "height"} +
+                    선택 항목 codec, preset, crf, video_bitrate, audio_bitrate
+                    (_rendition_output_args 참조). 최종 영상을 split으로 나눠 같은
+                    ffmpeg 호출에서 인코딩하며, <출력 파일명>_<name>.mp4로 저장됩니다.
+        output_format: "mp4" (기본), "fmp4" (fragmented MP4), "hls" (.m3u8 + fMP4 세그먼트).
+                       fmp4/hls는 임시 디렉토리를 거치지 않고 출력 경로에 바로 기록하므로
+                       인코딩 중에도 완료된 조각/세그먼트를 읽거나 업로드할 수 있고,
+                       렌더링이 중단돼도 그때까지의 세그먼트는 유효합니다.
+                       (clips 모드는 합치기 단계에서, single 모드는 처음부터 기록)
+        intermediate_codec: clips 모드의 슬라이드 클립 코덱 - "h264" (기본, 손실 압축 후
+                            스트림 복사로 합침), "h264_lossless" (x264 -qp 0 ultrafast),
+                            "ffv1", "raw" (무압축). 무손실 코덱은 클립 인코딩이 가볍고
+                            손실 인코딩을 합치기 단계에서 한 번만 하지만, 중간 파일이 큽니다.
+        transition: 슬라이드 전환 - "black" (기본, 슬라이드마다 검은 화면으로 페이드 인/아웃)
+                    또는 xfade 전환 이름 ("fade" 크로스페이드, "slideleft", "wipeleft" 등,
+                    TRANSITIONS 참조). xfade 전환은 이웃한 슬라이드를 transition_duration만큼
+                    겹쳐 최종 인코딩 그래프 안에서 전환하므로 영상이 전환 수만큼 짧아집니다.
     
     Returns:
-        생성된 영상 파일 경로
+        생성된 영상 파일 경로 (hls는 .m3u8 플레이리스트 경로)
     """
-    if not _check_ffmpeg():
+    caps = probe_ffmpeg(cache_dir)
+    if caps is None:
         print("❌ ffmpeg가 설치되어 있지 않습니다!")
         print("   설치 방법:")
         print("   - Windows: https://www.gyan.dev/ffmpeg/builds/")
@@ -189,6 +1716,35 @@ def create_video(
     if not slide_paths:
         raise ValueError("슬라이드가 없습니다!")
     
+    if render_mode not in ("clips", "single"):
+        raise ValueError(f"지원하지 않는 render_mode: {render_mode}")
+    
+    if motion_engine not in MOTION_ENGINES:
+        raise ValueError(f"지원하지 않는 motion_engine: {motion_engine}")
+    
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"지원하지 않는 output_format: {output_format}")
+    
+    if intermediate_codec not in INTERMEDIATE_CODECS:
+        raise ValueError(f"지원하지 않는 intermediate_codec: {intermediate_codec}")
+    
+    if transition not in TRANSITIONS:
+        raise ValueError(f"지원하지 않는 transition: {transition}")
+    
+    if not has_encoder(caps, "libx264"):
+        raise RuntimeError(f"ffmpeg {caps['version']}에 libx264 인코더가 없습니다.")
+    
+    for rendition in renditions or []:
+        _check_rendition(rendition)
+        codec = rendition.get("codec", "libx264")
+        if not has_encoder(caps, codec):
+            raise RuntimeError(f"ffmpeg {caps['version']}에 {codec} 인코더가 없습니다.")
+    
+    if not has_encoder(caps, INTERMEDIATE_CODECS[intermediate_codec][0]):
+        print(f"  ⚠️  {INTERMEDIATE_CODECS[intermediate_codec][0]} 인코더가 없어 "
+              f"h264 클립을 사용합니다.")
+        intermediate_codec = "h264"
+    
     has_tts = tts_data is not None and len(tts_data) == len(slide_paths)
     
     if has_tts:
@@ -196,166 +1752,117 @@ def create_video(
     else:
         print("🎬 영상 생성 중...")
     
-    temp_dir = os.path.dirname(slide_paths[0])
-    temp_videos = []
+    output_dir = os.path.dirname(output_path) or "."
+    os.makedirs(output_dir, exist_ok=True)
     
-    # 1단계: 각 슬라이드를 개별 비디오 클립으로 변환
-    for i, slide_path in enumerate(slide_paths):
-        temp_video = os.path.join(temp_dir, f"clip_{i:03d}.mp4")
-
-        # TTS가 있으면 오디오 길이 기반으로 슬라이드 시간 결정
-        if has_tts:
-            tts_info = tts_data[i]
-            tts_path = tts_info["path"]
-            # TTS 길이 + 여유 시간 (최소 slide_duration)
-            clip_duration = max(tts_info["duration"] + 0.5, slide_duration)
+    # 이 작업 전용 임시 디렉토리 (클립, concat 목록, 완성 전 영상)
+    # 같은 출력 디렉토리를 쓰는 다른 작업과 파일이 겹치지 않고, 정리도 이 디렉토리만 함
+    temp_dir = tempfile.mkdtemp(prefix="_temp_video_", dir=workspace or output_dir)
+    output_path = _output_target(output_path, output_format)
+    # fmp4/hls는 인코딩 중에 쓰인 부분을 바로 쓸 수 있도록 최종 경로에 직접 기록
+    streaming = output_format != "mp4"
+    
+    def render_target(final_path: str) -> str:
+        return final_path if streaming else os.path.join(temp_dir, os.path.basename(final_path))
+    
+    render_path = render_target(output_path)
+    # 추가 출력: (rendition, 렌더링 경로, 최종 경로)
+    rendition_jobs = [
+        (rendition, render_target(_rendition_path(output_path, rendition)),
+         _rendition_path(output_path, rendition))
+        for rendition in renditions or []
+    ]
+    if streaming:
+        print(f"  📡 {output_format} 출력: 인코딩 중 {output_path}에 바로 기록합니다")
+    if output_format == "hls":
+        # 같은 이름으로 남아 있던 세그먼트가 새 세그먼트와 섞이지 않도록 먼저 지움
+        for path in [output_path, *(final_path for _, _, final_path in rendition_jobs)]:
+            _remove_hls_files(path)
+    if rendition_jobs:
+        names = ", ".join(str(rendition["name"]) for rendition in renditions)
+        print(f"  🎞️  추가 출력 {len(rendition_jobs)}개 함께 인코딩: {names}")
+    
+    bgm_path = None
+    if bgm_enabled:
+        bgm_path = _find_bgm()
+        if bgm_path:
+            print(f"  🎵 배경음악 적용: {os.path.basename(bgm_path)}")
+        elif has_tts:
+            print("  ⚠️  BGM 파일을 찾을 수 없어 TTS만 사용합니다.")
         else:
-            tts_path = None
-            clip_duration = slide_duration
-
-        success = _create_slide_clip(
-            slide_path=slide_path,
-            output_path=temp_video,
-            duration=clip_duration,
-            fps=fps,
-            transition_duration=transition_duration,
-            tts_path=tts_path,
-            slide_index=i,
-        )
-        
-        if not success:
-            print(f"  ⚠️  슬라이드 {i+1} 변환 중 오류 발생")
-        
-        temp_videos.append(temp_video)
-        duration_str = f" ({clip_duration:.1f}초)" if has_tts else ""
-        print(f"  📹 슬라이드 {i+1}/{len(slide_paths)} 변환 완료{duration_str}")
+            print("  ⚠️  BGM 파일을 찾을 수 없어 음악 없이 생성합니다.")
     
-    # 2단계: concat 파일 생성
-    concat_file = os.path.join(temp_dir, "concat_list.txt")
-    with open(concat_file, "w") as f:
-        for video in temp_videos:
-            f.write(f"file '{os.path.abspath(video)}'\n")
+    if log_dir is None:
+        output_stem = os.path.splitext(os.path.basename(output_path))[0]
+        log_dir = os.path.join(output_dir, "logs", output_stem)
     
-    # 3단계: 영상 합치기
-    os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
+    # ffmpeg 기능에 맞는 Ken Burns 방식을 미리 고름 (슬라이드마다 실패 후 재시도하지 않도록)
+    ken_burns, motion_engine = _resolve_motion(caps, ken_burns, motion_engine, render_mode)
+    transition = _resolve_transition(caps, transition, fps, transition_duration)
+    plan = _clip_plan(len(slide_paths), tts_data, slide_duration, fps, transition, transition_duration)
     
-    # TTS가 있는 경우 concat 방식이 다름 (오디오 포함)
-    if has_tts:
-        # TTS 오디오가 포함된 클립들을 합치기
-        concat_cmd = [
-            "ffmpeg", "-y",
-            "-f", "concat", "-safe", "0", "-i", concat_file,
-            "-c:v", "libx264",
-            "-c:a", "aac",
-            "-b:a", "192k",
-            "-pix_fmt", "yuv420p",
-            "-movflags", "+faststart",
-        ]
-        
-        if bgm_enabled:
-            bgm_path = _find_bgm()
-            if bgm_path:
-                print(f"  🎵 배경음악 적용: {os.path.basename(bgm_path)}")
-                # TTS + BGM 믹싱: TTS 볼륨 유지, BGM 볼륨 낮춤
-                temp_no_bgm = os.path.join(temp_dir, "temp_no_bgm.mp4")
-                concat_cmd.append(temp_no_bgm)
-                
-                print("  🔧 TTS 영상 렌더링 중...")
-                result = subprocess.run(concat_cmd, capture_output=True, text=True)
-                if result.returncode != 0:
-                    raise RuntimeError(f"concat failed: {result.stderr[:200]}")
-                
-                # BGM 믹싱
-                print("  🎵 TTS + BGM 믹싱 중...")
-                mix_cmd = [
-                    "ffmpeg", "-y",
-                    "-i", temp_no_bgm,
-                    "-i", bgm_path,
-                    "-filter_complex",
-                    f"[0:a]volume=1.0[tts];[1:a]volume={bgm_volume}[bgm];"
-                    f"[tts][bgm]amix=inputs=2:duration=first[a]",
-                    "-map", "0:v",
-                    "-map", "[a]",
-                    "-c:v", "copy",
-                    "-c:a", "aac",
-                    "-b:a", "192k",
-                    "-movflags", "+faststart",
-                    output_path,
-                ]
-                print("  🔧 최종 영상 렌더링 중...")
-                result = subprocess.run(mix_cmd, capture_output=True, text=True)
-            else:
-                print("  ⚠️  BGM 파일을 찾을 수 없어 TTS만 사용합니다.")
-                concat_cmd.append(output_path)
-                print("  🔧 최종 영상 렌더링 중...")
-                result = subprocess.run(concat_cmd, capture_output=True, text=True)
+    try:
+        if render_mode == "single":
+            result = _render_single_pass(
+                slide_paths, plan, render_path, fps, transition_duration,
+                width, height, ken_burns, x264_preset, bgm_path, bgm_volume, motion_engine,
+                log_dir, on_progress,
+                [(rendition, path) for rendition, path, _ in rendition_jobs],
+                output_format, transition,
+            )
         else:
-            concat_cmd.append(output_path)
-            print("  🔧 최종 영상 렌더링 중...")
-            result = subprocess.run(concat_cmd, capture_output=True, text=True)
-    else:
-        # TTS 없는 기존 방식
-        if bgm_enabled:
-            bgm_path = _find_bgm()
-            if bgm_path:
-                print(f"  🎵 배경음악 적용: {os.path.basename(bgm_path)}")
-                cmd = [
-                    "ffmpeg", "-y",
-                    "-f", "concat", "-safe", "0", "-i", concat_file,
-                    "-i", bgm_path,
-                    "-c:v", "libx264",
-                    "-c:a", "aac",
-                    "-b:a", "128k",
-                    "-filter_complex", f"[1:a]volume={bgm_volume}[bgm];[bgm]apad[a]",
-                    "-map", "0:v",
-                    "-map", "[a]",
-                    "-shortest",
-                    "-pix_fmt", "yuv420p",
-                    output_path,
-                ]
-            else:
-                print("  ⚠️  BGM 파일을 찾을 수 없어 음악 없이 생성합니다.")
-                bgm_enabled = False
+            clip_cache_dir = None
+            if cache_dir:
+                clip_cache_dir = os.path.join(cache_dir, "clips")
+                os.makedirs(clip_cache_dir, exist_ok=True)
+            result = _render_with_clips(
+                slide_paths, plan, temp_dir, render_path, fps, transition_duration,
+                width, height, ken_burns, x264_preset, bgm_path, bgm_volume, cpu_budget,
+                motion_engine, caps["ffprobe"], log_dir, on_progress,
+                clip_cache_dir, clip_cache_mb, caps["version"],
+                [(rendition, path) for rendition, path, _ in rendition_jobs],
+                output_format, intermediate_codec, transition,
+            )
         
-        if not bgm_enabled:
-            cmd = [
-                "ffmpeg", "-y",
-                "-f", "concat", "-safe", "0", "-i", concat_file,
-                "-c:v", "libx264",
-                "-pix_fmt", "yuv420p",
-                "-movflags", "+faststart",
-                output_path,
-            ]
+        if result.returncode != 0:
+            print(f"❌ 영상 생성 실패: {result.stderr[-500:]}")
+            print(f"   📄 ffmpeg 로그: {log_dir}")
+            raise RuntimeError(f"ffmpeg failed: {result.stderr[-200:]}")
         
-        print("  🔧 최종 영상 렌더링 중...")
-        result = subprocess.run(cmd, capture_output=True, text=True)
-    
-    if result.returncode != 0:
-        print(f"❌ 영상 생성 실패: {result.stderr[:500]}")
-        raise RuntimeError(f"ffmpeg failed: {result.stderr[:200]}")
+        # 완성된 영상만 출력 경로로 옮김 (동시 작업이 반쯤 쓴 파일을 보지 않도록)
+        if render_path != output_path and os.path.exists(render_path):
+            _move_into_place(render_path, output_path)
+        for _, path, final_path in rendition_jobs:
+            if path != final_path and os.path.exists(path):
+                _move_into_place(path, final_path)
+    finally:
+        # 4단계: 임시 파일 정리 (이 작업의 임시 디렉토리만)
+        print("  🧹 임시 파일 정리 중...")
+        shutil.rmtree(temp_dir, ignore_errors=True)
     
-    # 4단계: 임시 파일 정리
-    print("  🧹 임시 파일 정리 중...")
-    try:
-        # 슬라이드 임시 디렉토리
-        shutil.rmtree(temp_dir)
-    except Exception:
-        pass
-    
-    # TTS 임시 디렉토리도 정리
-    tts_temp_dir = os.path.join(os.path.dirname(output_path), "_temp_tts")
-    if os.path.exists(tts_temp_dir):
-        try:
-            shutil.rmtree(tts_temp_dir)
-        except Exception:
-            pass
+    if workspace is None:
+        # 작업 공간 없이 호출된 경우: generate_slides/generate_all_tts가 만든 임시 디렉토리만 정리
+        # (입력 파일이 든 임의의 디렉토리는 지우지 않도록 디렉토리 이름으로 확인)
+        input_dirs = set()
+        if not isinstance(slide_paths[0], Image.Image):
+            input_dirs.add(os.path.dirname(slide_paths[0]))
+        if has_tts:
+            input_dirs.add(os.path.dirname(tts_data[0]["path"]))
+        for input_dir in input_dirs:
+            if os.path.basename(input_dir) in INPUT_TEMP_DIRS:
+                shutil.rmtree(input_dir, ignore_errors=True)
     
     # 결과 확인
     if os.path.exists(output_path):
-        file_size = os.path.getsize(output_path) / (1024 * 1024)  # MB
+        file_size = _output_size(output_path, output_format) / (1024 * 1024)  # MB
         print(f"✅ 영상 생성 완료!")
         print(f"   📁 파일: {output_path}")
         print(f"   📊 크기: {file_size:.1f} MB")
+        for rendition, _, final_path in rendition_jobs:
+            if os.path.exists(final_path):
+                rendition_size = _output_size(final_path, output_format) / (1024 * 1024)
+                print(f"   🎞️  {rendition['name']}: {final_path} ({rendition_size:.1f} MB)")
+        print(f"   📈 ffmpeg 로그/메트릭: {log_dir}")
         return output_path
     else:
         raise RuntimeError("영상 파일이 생성되지 않았습니다.")